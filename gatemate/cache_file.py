@@ -0,0 +1,45 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+# Helpers shared by on-disk caches and binary exports.
+
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+def get_cache_dir(cache_dir, env) -> Optional[str]:
+    """Returns cache_dir, or value of environment variable env if not given."""
+    if cache_dir is None:
+        cache_dir = os.environ.get(env)
+    return cache_dir or None
+
+@contextmanager
+def write_atomic(path):
+    """Opens temporary file for writing, it replaces path only if writing succeeds."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
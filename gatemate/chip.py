@@ -18,12 +18,21 @@
 
 import die
 import os
+import multiprocessing
+from array import array
+from functools import cache, lru_cache
+from itertools import compress, islice, product
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from die import Die, Location, Connection
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict
 from timing import decompress_timing
+import timing_cache
 
 DATABASE_VERSION = 1.11
+# Increase when output of get_timings changes for same .dly data
+TIMING_VERSION = 1
+TIMING_CORNERS = [f"{speed}_{mode}" for speed in ("best", "typ", "worst") for mode in ("eco", "lpr", "spd")]
 
 @dataclass(eq=True, order=True)
 class Pad:
@@ -41,7 +50,7 @@ class Bank:
     die : str
     bank: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimingDelay:
     min : int
     typ : int
@@ -57,20 +66,109 @@ class TimingDelay:
             return NotImplemented
         return TimingDelay(self.min - other.min, self.typ - other.typ, self.max - other.max)
 
-@dataclass
 class Timing:
-    rise : TimingDelay
-    fall : TimingDelay
+    """Rise and fall delays, stored as six ints in slots.
+
+    Arithmetic builds only the resulting object, rise and fall are
+    created as TimingDelay on access. Instances are immutable and
+    hashable, as they are shared through TimingPalette.
+    """
+    __slots__ = ("r_min", "r_typ", "r_max", "f_min", "f_typ", "f_max")
+
+    def __init__(self, rise : TimingDelay, fall : TimingDelay):
+        init_timing(self, rise.min, rise.typ, rise.max, fall.min, fall.typ, fall.max)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field '{name}'")
+
+    @property
+    def rise(self) -> TimingDelay:
+        return TimingDelay(self.r_min, self.r_typ, self.r_max)
+
+    @property
+    def fall(self) -> TimingDelay:
+        return TimingDelay(self.f_min, self.f_typ, self.f_max)
 
     def __add__(self, other):
         if not isinstance(other, Timing):
             return NotImplemented
-        return Timing(self.rise + other.rise, self.fall + other.fall)
+        return make_timing(self.r_min + other.r_min, self.r_typ + other.r_typ, self.r_max + other.r_max,
+                           self.f_min + other.f_min, self.f_typ + other.f_typ, self.f_max + other.f_max)
 
     def __sub__(self, other):
         if not isinstance(other, Timing):
             return NotImplemented
-        return Timing(self.rise - other.rise, self.fall - other.fall)
+        return make_timing(self.r_min - other.r_min, self.r_typ - other.r_typ, self.r_max - other.r_max,
+                           self.f_min - other.f_min, self.f_typ - other.f_typ, self.f_max - other.f_max)
+
+    def __eq__(self, other):
+        if not isinstance(other, Timing):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __reduce__(self):
+        return (make_timing, self.as_tuple())
+
+    def __repr__(self):
+        return f"Timing(rise={self.rise!r}, fall={self.fall!r})"
+
+    def as_tuple(self):
+        """Returns (rise min/typ/max, fall min/typ/max) as 6-tuple."""
+        return (self.r_min, self.r_typ, self.r_max, self.f_min, self.f_typ, self.f_max)
+
+    @staticmethod
+    def from_values(v) -> 'Timing':
+        return make_timing(*v)
+
+def make_timing(r_min, r_typ, r_max, f_min, f_typ, f_max) -> Timing:
+    """Creates Timing from six ints without intermediate TimingDelay objects."""
+    return init_timing(object.__new__(Timing), r_min, r_typ, r_max, f_min, f_typ, f_max)
+
+def init_timing(t, r_min, r_typ, r_max, f_min, f_typ, f_max) -> Timing:
+    # Slots are set through their descriptors, Timing.__setattr__ forbids it
+    SET_R_MIN(t, r_min)
+    SET_R_TYP(t, r_typ)
+    SET_R_MAX(t, r_max)
+    SET_F_MIN(t, f_min)
+    SET_F_TYP(t, f_typ)
+    SET_F_MAX(t, f_max)
+    return t
+
+SET_R_MIN, SET_R_TYP, SET_R_MAX, SET_F_MIN, SET_F_TYP, SET_F_MAX = (getattr(Timing, name).__set__ for name in Timing.__slots__)
+
+def sum_path(timings) -> Timing:
+    """Sums delays of all elements on a path, allocating only the result."""
+    r_min = r_typ = r_max = f_min = f_typ = f_max = 0
+    for t in timings:
+        r_min += t.r_min
+        r_typ += t.r_typ
+        r_max += t.r_max
+        f_min += t.f_min
+        f_typ += t.f_typ
+        f_max += t.f_max
+    return make_timing(r_min, r_typ, r_max, f_min, f_typ, f_max)
+
+def max_of(timings) -> Timing:
+    """Element-wise maximum of delays, e.g. for converging paths."""
+    it = iter(timings)
+    try:
+        r_min, r_typ, r_max, f_min, f_typ, f_max = next(it).as_tuple()
+    except StopIteration:
+        raise ValueError("max_of() arg is an empty iterable") from None
+    for t in it:
+        if t.r_min > r_min: r_min = t.r_min
+        if t.r_typ > r_typ: r_typ = t.r_typ
+        if t.r_max > r_max: r_max = t.r_max
+        if t.f_min > f_min: f_min = t.f_min
+        if t.f_typ > f_typ: f_typ = t.f_typ
+        if t.f_max > f_max: f_max = t.f_max
+    return make_timing(r_min, r_typ, r_max, f_min, f_typ, f_max)
 
 @dataclass
 class Chip:
@@ -118,6 +216,26 @@ class Chip:
         conn = dict()
         for d in self.dies.values():
             d.create_in_die_connections(conn)
+        for c in self.d2d_connections():
+            self.create_conn(conn, *c)
+        return conn.items()
+
+    def iter_connections(self):
+        """Yields same connections as get_connections as (src, [dst...]), die by die and tile by tile.
+
+        Same source can be in more than one group, merging groups in
+        order gives result of get_connections.
+        """
+        for d in self.dies.values():
+            yield from d.iter_in_die_connections()
+        conn = dict()
+        for c in self.d2d_connections():
+            self.create_conn(conn, *c)
+        for items in conn.values():
+            yield items[0], items[1:]
+
+    def d2d_connections(self):
+        """Yields (src_x, src_y, src, dst_x, dst_y, dst, delay) for connections between dies."""
         if self.name=="CCGM1A2":
             for x in range(27, 163):
                 if x == 27:
@@ -132,15 +250,14 @@ class Chip:
                     sbb_y = -1 + offset_y if x % 2 == 1 else 0 + offset_y
                     sbt_y = 129 if x % 2 == 1 else 130
 
-                    self.create_conn(conn, x, sbb_y, f"{die.get_sb_type(x,sbb_y-offset_y)}.P{plane}.Y4", x, sbt_y, f"{die.get_sb_type(x,sbt_y)}.P{plane}.D2_4_D2D", delay="del_D2D")
+                    yield (x, sbb_y, f"{die.get_sb_type(x,sbb_y-offset_y)}.P{plane}.Y4", x, sbt_y, f"{die.get_sb_type(x,sbt_y)}.P{plane}.D2_4_D2D", "del_D2D")
 
                     if x > 27 and (x != 28 or p > 4):
                         # no connection for 27, and for 28 just 4 signals from lower to upper
                         if x > 160:
-                            self.create_conn(conn, x, sbt_y, f"{die.get_sb_type(x,sbt_y)}.P{plane}.Y2",  x, sbb_y, f"{die.get_sb_type(x,sbb_y-offset_y)}.P{plane}.D2_2_D2D", delay="del_D2D")
+                            yield (x, sbt_y, f"{die.get_sb_type(x,sbt_y)}.P{plane}.Y2",  x, sbb_y, f"{die.get_sb_type(x,sbb_y-offset_y)}.P{plane}.D2_2_D2D", "del_D2D")
                         else:
-                            self.create_conn(conn, x, 131, f"TES.MDIE2.P{p}",  x, sbb_y, f"{die.get_sb_type(x,sbb_y-offset_y)}.P{plane}.D2_2_D2D", delay="del_D2D")
-        return conn.items()
+                            yield (x, 131, f"TES.MDIE2.P{p}",  x, sbb_y, f"{die.get_sb_type(x,sbb_y-offset_y)}.P{plane}.D2_2_D2D", "del_D2D")
     
     def get_packages(self):
         return self.packages
@@ -251,118 +368,205 @@ def get_device(name):
     return CCGM1_DEVICES[name]
 
 def convert_delay(d):
-    return Timing(TimingDelay(d.rise.min, d.rise.typ, d.rise.max), TimingDelay(d.fall.min, d.fall.typ, d.fall.max))
+    return make_timing(d.rise.min, d.rise.typ, d.rise.max, d.fall.min, d.fall.typ, d.fall.max)
 
 def convert_delay_val(d):
-    return Timing(TimingDelay(d.min, d.typ, d.max), TimingDelay(d.min, d.typ, d.max))
+    return make_timing(d.min, d.typ, d.max, d.min, d.typ, d.max)
 
 def convert_ram_delay(d):
-    return Timing(TimingDelay(d.time1.min, d.time1.typ, d.time1.max), TimingDelay(d.time2.min, d.time2.typ, d.time2.max))
-
-def check_dly_available():
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    return os.path.exists(os.path.join(current_dir, "..", "delay", "cc_worst_spd_dly.dly"))
+    return make_timing(d.time1.min, d.time1.typ, d.time1.max, d.time2.min, d.time2.typ, d.time2.max)
 
-def get_timings(name):
-    val = dict()
+@dataclass
+class TimingPalette:
+    """Unique delay values of a corner, each stored once as shared Timing."""
+    timings : List[Timing] = field(default_factory=list)
+    lookup : Dict[tuple,int] = field(default_factory=dict)
+
+    def add(self, v) -> int:
+        """Returns palette index for (rise min/typ/max, fall min/typ/max) tuple."""
+        idx = self.lookup.get(v)
+        if idx is None:
+            idx = len(self.timings)
+            self.lookup[v] = idx
+            self.timings.append(Timing.from_values(v))
+        return idx
+
+    def get(self, v) -> Timing:
+        idx = self.lookup.get(v)
+        if idx is None:
+            idx = self.add(v)
+        return self.timings[idx]
+
+    def intern(self, t) -> Timing:
+        return self.get(t.as_tuple())
+
+def get_dly_path(name):
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    timing_data = decompress_timing(os.path.join(current_dir, "..", "delay", f"cc_{name}_dly.dly"))
-
-    for i1 in range(4):  # [1..4]
-        for i2 in range(8):  # [1..8]
-            for i3 in range(4):  # [1..4]
-                for i4 in range(12):  # [1..12]
-                    for i5 in range(5):  # [0..4]
-                        for i6 in range(8):  # [0..7]
-                            d = timing_data.SB_del_tile_arr[i1][i2][i3][i4][i5][i6]
-                            if d.rise.min == 123456: # not connected
-                                continue
-                            x = i2+1
-                            y = i3+1
-                            y = 2*y if (x % 2 == 0) else 2*y-1
-                            name = f"sb_del_t{i1+1}_x{x}_y{y}_p{i4+1}_d{i5}_s{i6}"
-                            val[name] = convert_delay(d)
-
-    for i1 in range(2):  # [1..2]
-        for i2 in range(8):  # [1..8]
-            for i3 in range(8):  # [1..8]
-                for i4 in range(12):  # [1..12]
-                    for i5 in range(8):  # [0..7]
-                        d = timing_data.IM_del_tile_arr[i1][i2][i3][i4][i5]
-                        if d.rise.min == 123456: # not connected
-                            continue
-                        name = f"im_x{i2+1}_y{i3+1}_p{i4+1}_d{i5}_path{i1+1}"
-                        val[name] = convert_delay(d)
-
-    for i1 in range(8):  # [1..8]
-        for i2 in range(8):  # [1..8]
-            for i3 in range(4):  # [9..12]
-                for i4 in range(4):  # [0..3]
-                    d = timing_data.OM_del_tile_arr[i1][i2][i3][i4]
-                    if d.rise.min == 123456: # not connected
-                        continue
-                    name = f"om_x{i1+1}_y{i2+1}_p{i3+9}_d{i4}"
-                    val[name] = convert_delay(d)
-
-    cnt_ccy1 = 1
-    cnt_cpy1 = 1
-    cnt_pcy1 = 1
-    cnt_ppy1 = 1
-    for i1 in range(10):  # [0..9]
-        for i2 in range(19):  # [1..19]
-            for i3 in range(10):  # [1..10]
-                d = timing_data.CPE_del_tile_arr[i1][i2][i3]
-                if d.name == "CPE": # not used
-                    continue
-                # These are wrong names in timing database
-                # and need fixing
-                if d.name == "_ROUTING_CINY2_COUTY":
-                    d.name = "_ROUTING_CINY2_COUTY2"
-                if d.name == "_ROUTING_PINY2_POUTY":
-                    d.name = "_ROUTING_PINY2_POUTY2"
-
-                if d.name == "_ROUTING_CINY1_COUTY":
-                    if cnt_ccy1 == 1:
-                        d.name = "_ROUTING_CINY1_COUTY1"
-                        cnt_ccy1 = 2
-                    else:
-                        d.name = "_ROUTING_CINY1_COUTY2"
-                        cnt_ccy1 = 1
-                if d.name == "_ROUTING_CINY1_POUTY":
-                    if cnt_cpy1 == 1:
-                        d.name = "_ROUTING_CINY1_POUTY1"
-                        cnt_cpy1 = 2
-                    else:
-                        d.name = "_ROUTING_CINY1_POUTY2"
-                        cnt_cpy1 = 1
-                if d.name == "_ROUTING_PINY1_COUTY":
-                    if cnt_pcy1 == 1:
-                        d.name = "_ROUTING_PINY1_COUTY1"
-                        cnt_pcy1 = 2
-                    else:
-                        d.name = "_ROUTING_PINY1_COUTY2"
-                        cnt_pcy1 = 1
-                if d.name == "_ROUTING_PINY1_POUTY":
-                    if cnt_ppy1 == 1:
-                        d.name = "_ROUTING_PINY1_POUTY1"
-                        cnt_ppy1 = 2
-                    else:
-                        d.name = "_ROUTING_PINY1_POUTY2"
-                        cnt_ppy1 = 1
-                val[d.name] = convert_delay(d.val)
-
-    for i1 in range(165):  # [-2..162]
-        for i2 in range(4):  # [1..4]
-            for i3 in range(12):  # [1..12]
-                for i4 in range(5):  # [0..4]
-                    for i5 in range(8):  # [0..7]
-                        d = timing_data.SB_del_rim_arr[i1][i2][i3][i4][i5]
-                        if d.rise.min == 123456: # not connected
-                            continue
-                        name = f"sb_rim_xy{i1-2}_s{i2+1}_p{i3+1}_d{i4}_s{i5}"
-                        val[name] = convert_delay(d)
+    return os.path.join(current_dir, "..", "delay", f"cc_{name}_dly.dly")
 
+def check_dly_available():
+    return os.path.exists(get_dly_path("worst_spd"))
+
+def flatten_timings(val):
+    names = list(val.keys())
+    values = []
+    for t in val.values():
+        values += t.as_tuple()
+    return names, values
+
+def unflatten_timings(names, values, palette=None):
+    if palette is None:
+        palette = TimingPalette()
+    d = iter(values)
+    return dict(zip(names, map(palette.get, zip(d, d, d, d, d, d))))
+
+def palettize_timings(names, values):
+    """Returns (palette, index) so that delay names[i] is palette[index[i]]."""
+    palette = TimingPalette()
+    d = iter(values)
+    index = array('i', map(palette.add, zip(d, d, d, d, d, d)))
+    return palette.timings, index
+
+def get_timing_cache_path(name, cache_dir=None):
+    """Returns cache file path for corner, or None if caching is disabled."""
+    cache_dir = timing_cache.get_cache_dir(cache_dir)
+    if cache_dir is None:
+        return None
+    return os.path.join(cache_dir, f"cc_{name}_timing.cache")
+
+def get_timing_cache_entry(name, cache_dir=None):
+    cache_path = get_timing_cache_path(name, cache_dir)
+    if cache_path is None:
+        return None
+    key = timing_cache.cache_key(get_dly_path(name), DATABASE_VERSION, TIMING_VERSION)
+    return key, cache_path
+
+def get_timings(name, cache_dir=None):
+    """Returns dict of delay name to Timing for given corner.
+
+    Results are memoized per corner and .dly file identity, every call
+    returns a new dict sharing the same immutable Timing values.
+    """
+    dly_path = os.path.abspath(get_dly_path(name))
+    st = os.stat(dly_path)
+    return dict(load_timings(name, (dly_path, st.st_mtime_ns, st.st_size), timing_cache.get_cache_dir(cache_dir)))
+
+@lru_cache(maxsize=len(TIMING_CORNERS))
+def load_timings(name, file_id, cache_dir):
+    entry = get_timing_cache_entry(name, cache_dir)
+    if entry is None:
+        return build_timings(get_dly_path(name))
+
+    key, cache_path = entry
+    cached = timing_cache.load(cache_path, key)
+    if cached is not None:
+        return unflatten_timings(*cached)
+    val = build_timings(get_dly_path(name))
+    timing_cache.store(cache_path, key, *flatten_timings(val))
+    return val
 
+def get_flat_timings(name, cache_dir=None):
+    """Returns (names, values), values being int32 array with 6 entries per name."""
+    entry = get_timing_cache_entry(name, cache_dir)
+    if entry is not None:
+        key, cache_path = entry
+        cached = timing_cache.load(cache_path, key)
+        if cached is not None:
+            return cached[0], array('i', cached[1])
+    names, values = flatten_timings(get_timings(name, cache_dir))
+    return names, array('i', values)
+
+def get_timing_palette(name, cache_dir=None):
+    """Returns (names, palette, index) with one shared Timing per distinct value."""
+    names, values = get_flat_timings(name, cache_dir)
+    return (names, *palettize_timings(names, values))
+
+def get_packed_timings(name, cache_dir=None):
+    # Names joined in single string are much cheaper to pickle
+    names, values = get_flat_timings(name, cache_dir)
+    return "\n".join(names), values
+
+def _submit_timings(executor, corners, cache_dir):
+    return { name : executor.submit(get_packed_timings, name, cache_dir) for name in corners }
+
+def _collect_timings(futures, flat=False):
+    result = dict()
+    for name, future in futures.items():
+        names, values = future.result()
+        names = names.split("\n")
+        result[name] = (names, values) if flat else unflatten_timings(names, values)
+    return result
+
+def _worker_count(corners, workers):
+    if workers is None:
+        workers = min(len(corners), os.cpu_count() or 1)
+    return max(workers, 1)
+
+def get_all_timings(corners=None, workers=None, cache_dir=None, flat=False, mp_context=None):
+    """Loads multiple timing corners in parallel worker processes.
+
+    Returns dict of corner name to get_timings result, or to
+    get_flat_timings result when flat is set. Workers are started with
+    mp_context, default one if None.
+    """
+    if corners is None:
+        corners = TIMING_CORNERS
+    with ProcessPoolExecutor(max_workers=_worker_count(corners, workers), mp_context=mp_context) as executor:
+        return _collect_timings(_submit_timings(executor, corners, cache_dir), flat)
+
+def _finish_prefetch(executor, futures):
+    try:
+        return _collect_timings(futures)
+    finally:
+        executor.shutdown(wait=True)
+
+def prefetch_timings(names=None, workers=None, cache_dir=None) -> Future:
+    """Starts loading timing corners in background, returns immediately.
+
+    Corners are built in worker processes, so caller can meanwhile do
+    other work, e.g. Chip.get_connections. Returned future resolves to
+    dict of corner name to get_timings result.
+    """
+    if names is None:
+        names = TIMING_CORNERS
+    elif isinstance(names, str):
+        names = [names]
+    # With fork all workers are launched on first submit, still from
+    # calling thread and before helper thread exists. Unlike forkserver
+    # and spawn this does not re-import __main__ in workers, so flow
+    # scripts can call it at top level.
+    context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    executor = ProcessPoolExecutor(max_workers=_worker_count(names, workers), mp_context=context)
+    try:
+        futures = _submit_timings(executor, names, cache_dir)
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    helper = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch_timings")
+    future = helper.submit(_finish_prefetch, executor, futures)
+    helper.shutdown(wait=False)
+    return future
+
+def sb_del_tile_names():
+    for i1, i2, i3, i4, i5, i6 in product(range(4), range(8), range(4), range(12), range(5), range(8)):
+        x = i2+1
+        y = i3+1
+        y = 2*y if (x % 2 == 0) else 2*y-1
+        yield f"sb_del_t{i1+1}_x{x}_y{y}_p{i4+1}_d{i5}_s{i6}"
+
+def im_del_tile_names():
+    for i1, i2, i3, i4, i5 in product(range(2), range(8), range(8), range(12), range(8)):
+        yield f"im_x{i2+1}_y{i3+1}_p{i4+1}_d{i5}_path{i1+1}"
+
+def om_del_tile_names():
+    for i1, i2, i3, i4 in product(range(8), range(8), range(4), range(4)):
+        yield f"om_x{i1+1}_y{i2+1}_p{i3+9}_d{i4}"
+
+def sb_del_rim_names():
+    for i1, i2, i3, i4, i5 in product(range(165), range(4), range(12), range(5), range(8)):
+        yield f"sb_rim_xy{i1-2}_s{i2+1}_p{i3+1}_d{i4}_s{i5}"
+
+def edge_del_names():
     inputs_all = [ 'CLOCK0','CLOCK1','CLOCK2','CLOCK3',
                'SB_P1', 'SB_P2', 'SB_P3', 'SB_P4', 'SB_P5', 'SB_P6', 'SB_P7', 'SB_P8']
     inputs_left_bot = [ 'MDIE_P1', 'MDIE_P2', 'MDIE_P3', 'MDIE_P4', 'MDIE_P5', 'MDIE_P6', 'MDIE_P7', 'MDIE_P8' ]
@@ -370,52 +574,43 @@ def get_timings(name):
     inputs_bot = [ 'P_CINY1', 'P_CINY2', 'P_PINY1', 'P_PINY2']
     outputs_right_top = [ 'MDIE_P1', 'MDIE_P2', 'MDIE_P3', 'MDIE_P4', 'MDIE_P5', 'MDIE_P6', 'MDIE_P7', 'MDIE_P8' ]
     outputs_left_bot = [ 'CINX', 'CINY1', 'CINY2', 'PINX', 'PINY1', 'PINY2', 'DUMMY', 'DUMMY']
-    for i1 in range(165):  # [-2..162]
-        for i2 in range(4):  # [1..4]
-            inputs = inputs_all
-            outputs = []
-            match i2:
-                case 0 | 1 : # right, top
-                    inputs += inputs_right_top
-                    inputs += [ 'DUMMY', 'DUMMY', 'DUMMY' ,'DUMMY']
-                    outputs += outputs_right_top
-                case 2: # left
-                    inputs += inputs_left_bot
-                    inputs += [ 'DUMMY', 'DUMMY', 'DUMMY' ,'DUMMY']
-                    outputs += outputs_left_bot
-                case 3: # bottom
-                    inputs += inputs_left_bot + inputs_bot
-                    outputs += outputs_left_bot
-            for i3 in range(24):  # [1..24]
-                for i4 in range(8):  # [1..8]
-                    d = timing_data.Edge_del_arr[i1][i2][i3][i4]
-                    if d.rise.min == 123456: # not connected
-                        continue
-                    name = f"edge_xy{i1-2}_s{i2+1}_{inputs[i3]}_{outputs[i4]}"
-                    val[name] = convert_delay(d)
-
+    edge_inputs = []
+    edge_outputs = []
+    for i2 in range(4):  # [1..4]
+        # NOTE: inputs is alias of inputs_all, so first 24 entries
+        # stay the same for all sides, kept as is to preserve names
+        inputs = inputs_all
+        outputs = []
+        match i2:
+            case 0 | 1 : # right, top
+                inputs += inputs_right_top
+                inputs += [ 'DUMMY', 'DUMMY', 'DUMMY' ,'DUMMY']
+                outputs += outputs_right_top
+            case 2: # left
+                inputs += inputs_left_bot
+                inputs += [ 'DUMMY', 'DUMMY', 'DUMMY' ,'DUMMY']
+                outputs += outputs_left_bot
+            case 3: # bottom
+                inputs += inputs_left_bot + inputs_bot
+                outputs += outputs_left_bot
+        edge_inputs.append(inputs[:24])
+        edge_outputs.append(outputs)
+    for i1, i2, i3, i4 in product(range(165), range(4), range(24), range(8)):
+        yield f"edge_xy{i1-2}_s{i2+1}_{edge_inputs[i2][i3]}_{edge_outputs[i2][i4]}"
+
+def io_sel_del_names():
     inputs = [ 'CLOCK0','CLOCK1','CLOCK2','CLOCK3','OUT1','OUT2','OUT3','OUT4','GPIO_IN','RESET','DDR']
     outputs = [ 'IN1','IN2','GPIO_OUT','GPIO_EN' ]
+    for i1, i2 in product(range(11), range(4)):
+        yield f"io_sel_{inputs[i1]}_{outputs[i2]}"
 
-    for i1 in range(11):  # [1..11]
-        for i2 in range(4):  # [1..4]
-            d = timing_data.IO_SEL_del_arr[i1][i2]
-            if d.rise.min == 123456: # not connected
-                continue
-            name = f"io_sel_{inputs[i1]}_{outputs[i2]}"
-            val[name] = convert_delay(d)
-
-    
+def clkin_del_names():
     inputs = [ 'CLK0','CLK1','CLK2','CLK3','SER_CLK','SPI_CLK','JTAG_CLK']
     outputs = [ 'CLK_REF0','CLK_REF1','CLK_REF2','CLK_REF3' ]
-    for i1 in range(7): # [1..7]
-        for i2 in range(4): # [1..4]
-            d = timing_data.CLKIN_del_arr[i1][i2]
-            if d.rise.min == 123456: # not connected
-                continue
-            name = f"clkin_{inputs[i1]}_{outputs[i2]}"
-            val[name] = convert_delay(d)
+    for i1, i2 in product(range(7), range(4)):
+        yield f"clkin_{inputs[i1]}_{outputs[i2]}"
 
+def glbout_del_names():
     inputs = [ 'CLK0_0','CLK90_0','CLK180_0','CLK270_0','CLK_REF_OUT0',
                'CLK0_1','CLK90_1','CLK180_1','CLK270_1','CLK_REF_OUT1',
                'CLK0_2','CLK90_2','CLK180_2','CLK270_2','CLK_REF_OUT2',
@@ -424,25 +619,88 @@ def get_timings(name):
                'USR_FB0', 'USR_FB1', 'USR_FB2', 'USR_FB3' ]
     outputs = [ 'GLB0','GLB1','GLB2','GLB3',
                 'CLK_FB0','CLK_FB1','CLK_FB2','CLK_FB3']
-    for i1 in range(28): # [1..28]
-        for i2 in range(8): # [1..8]
-            d = timing_data.GLBOUT_del_arr[i1][i2]
-            if d.rise.min == 123456: # not connected
-                continue
-            name = f"glbout_{inputs[i1]}_{outputs[i2]}"
-            val[name] = convert_delay(d)
-    # All feedback delays calculated are same, we just take one
-    val["glbout_FEEDBACK_delay"] = val["glbout_CLK0_0_CLK_FB0"] - val["glbout_CLK0_0_GLB0"]
+    for i1, i2 in product(range(28), range(8)):
+        yield f"glbout_{inputs[i1]}_{outputs[i2]}"
 
+def pll_del_names():
     inputs = ['clk_ref_i','clock_core0_i','adpll_enable_i','adpll_status_read_i','locked_steady_reset_i','autn_en_i','reset_n_i']
     outputs = ['clk_core0_o','clk_core90_o','clk_core180_o','clk_core270_o', 'pll_locked_o', 'pll_locked_steady_o']
-    for i1 in range(7): # [1..7]
-        for i2 in range(6): # [1..6]
-            d = timing_data.PLL_del_arr[i1][i2]
-            if d.rise.min == 123456: # not connected
-                continue
-            name = f"pll_{inputs[i1]}_{outputs[i2]}"
-            val[name] = convert_delay(d)
+    for i1, i2 in product(range(7), range(6)):
+        yield f"pll_{inputs[i1]}_{outputs[i2]}"
+
+DELAY_NAME_GENERATORS = {
+    "SB_del_tile_arr" : sb_del_tile_names,
+    "IM_del_tile_arr" : im_del_tile_names,
+    "OM_del_tile_arr" : om_del_tile_names,
+    "SB_del_rim_arr"  : sb_del_rim_names,
+    "Edge_del_arr"    : edge_del_names,
+    "IO_SEL_del_arr"  : io_sel_del_names,
+    "CLKIN_del_arr"   : clkin_del_names,
+    "GLBOUT_del_arr"  : glbout_del_names,
+    "PLL_del_arr"     : pll_del_names,
+}
+
+@cache
+def get_delay_names(section):
+    """Returns delay names for every entry of section, in flattened (row-major) order.
+
+    Computed once per process and shared by all corners.
+    """
+    return tuple(DELAY_NAME_GENERATORS[section]())
+
+# These are wrong names in timing database and need fixing
+CPE_DELAY_NAME_FIXES = {
+    "_ROUTING_CINY2_COUTY" : "_ROUTING_CINY2_COUTY2",
+    "_ROUTING_PINY2_POUTY" : "_ROUTING_PINY2_POUTY2",
+}
+# These appear in pairs, first one gets suffix 1 and second one 2
+CPE_DELAY_NAME_PAIRS = [ "_ROUTING_CINY1_COUTY", "_ROUTING_CINY1_POUTY", "_ROUTING_PINY1_COUTY", "_ROUTING_PINY1_POUTY" ]
+
+@cache
+def get_cpe_delay_names(raw_names):
+    """Maps flattened CPE_del_tile_arr names to fixed delay names, None for unused entries."""
+    count = { name : 0 for name in CPE_DELAY_NAME_PAIRS }
+    names = []
+    for name in raw_names:
+        if name == "CPE": # not used
+            names.append(None)
+            continue
+        name = CPE_DELAY_NAME_FIXES.get(name, name)
+        if name in count:
+            count[name] += 1
+            name += "1" if count[name] % 2 == 1 else "2"
+        names.append(name)
+    return tuple(names)
+
+def add_section_timings(val, palette, timing_data, section):
+    arr = getattr(timing_data, section)
+    d = iter(arr.values)
+    val.update(zip(compress(get_delay_names(section), arr.mask), map(palette.get, zip(d, d, d, d, d, d))))
+
+def build_timings(dly_path):
+    val = dict()
+    palette = TimingPalette()
+    timing_data = decompress_timing(dly_path, stream=True, sparse=True)
+
+    add_section_timings(val, palette, timing_data, "SB_del_tile_arr")
+    add_section_timings(val, palette, timing_data, "IM_del_tile_arr")
+    add_section_timings(val, palette, timing_data, "OM_del_tile_arr")
+
+    cpe = [d for level1 in timing_data.CPE_del_tile_arr for level2 in level1 for d in level2]
+    for name, d in zip(get_cpe_delay_names(tuple(d.name for d in cpe)), cpe):
+        if name is not None:
+            val[name] = palette.intern(convert_delay(d.val))
+
+    add_section_timings(val, palette, timing_data, "SB_del_rim_arr")
+    add_section_timings(val, palette, timing_data, "Edge_del_arr")
+    add_section_timings(val, palette, timing_data, "IO_SEL_del_arr")
+    add_section_timings(val, palette, timing_data, "CLKIN_del_arr")
+    add_section_timings(val, palette, timing_data, "GLBOUT_del_arr")
+    # All feedback delays calculated are same, we just take one
+    val["glbout_FEEDBACK_delay"] = palette.intern(val["glbout_CLK0_0_CLK_FB0"] - val["glbout_CLK0_0_GLB0"])
+
+    add_section_timings(val, palette, timing_data, "PLL_del_arr")
+    first_other = len(val)
 
     for i in range(1,15):
         item = timing_data.FPGA_ram_del_1.del_entry[i]
@@ -455,7 +713,7 @@ def get_timings(name):
             case 4:
                 name += "WIDTH"
         val[name] = convert_ram_delay(timing_data.FPGA_ram_del_1.del_entry[i])
-    val["RAM_NOECC_IOPATH_4"] = Timing(TimingDelay(0,0,0), TimingDelay(0,0,0))
+    val["RAM_NOECC_IOPATH_4"] = make_timing(0, 0, 0, 0, 0, 0)
     
     for i in range(1,16):
         item = timing_data.FPGA_ram_del_2.del_entry[i]
@@ -550,7 +808,7 @@ def get_timings(name):
     val["del_CP_clkin"] = convert_delay(timing_data.timing_delays.del_CP_clkin.val)
     val["del_CP_enin"] = convert_delay(timing_data.timing_delays.del_CP_enin.val)
 
-    val["del_D2D"] = Timing(TimingDelay(1000,1000,1000), TimingDelay(1000,1000,1000))
+    val["del_D2D"] = make_timing(1000, 1000, 1000, 1000, 1000, 1000)
 
     #val["del_preplace"] = convert_delay(timing_data.timing_delays.del_preplace.val)
 
@@ -560,4 +818,7 @@ def get_timings(name):
             continue
         val[d.name] = convert_delay(d.val)
 
+    # Share single instance between all keys with same delay
+    for name in islice(val, first_other, None):
+        val[name] = palette.intern(val[name])
     return val
@@ -0,0 +1,130 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import numpy as np
+import chip
+from dataclasses import dataclass, field
+from typing import List, Dict
+from timing import NOT_CONNECTED
+
+RISE = 0
+FALL = 1
+MIN = 0
+TYP = 1
+MAX = 2
+
+@dataclass
+class DelayMatrix:
+    """Delays of multiple corners in one int32 array.
+
+    values is shaped [corner, delay_id, rise/fall, min/typ/max] where
+    delay_id is index of delay name in sorted names. Delays not existing
+    in a corner are marked in present and filled with NOT_CONNECTED.
+    """
+    corners : List[str]
+    names : List[str]
+    values : np.ndarray
+    present : np.ndarray
+    ids : Dict[str,int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.ids = { name : i for i, name in enumerate(self.names) }
+
+    @staticmethod
+    def from_flat(flat) -> 'DelayMatrix':
+        """Builds matrix from dict of corner to get_flat_timings result."""
+        corners = list(flat.keys())
+        names = sorted(set().union(*(names for names, _ in flat.values())))
+        ids = { name : i for i, name in enumerate(names) }
+        values = np.full((len(corners), len(names), 2, 3), NOT_CONNECTED, dtype=np.int32)
+        present = np.zeros((len(corners), len(names)), dtype=bool)
+        for c, (corner_names, corner_values) in enumerate(flat.values()):
+            idx = np.fromiter((ids[name] for name in corner_names), dtype=np.intp, count=len(corner_names))
+            values[c, idx] = np.frombuffer(corner_values, dtype=np.int32).reshape(-1, 2, 3)
+            present[c, idx] = True
+        return DelayMatrix(corners, names, values, present)
+
+    @staticmethod
+    def load(corners=None, workers=None, cache_dir=None) -> 'DelayMatrix':
+        return DelayMatrix.from_flat(chip.get_all_timings(corners, workers, cache_dir, flat=True))
+
+    def corner_index(self, corner) -> int:
+        return self.corners.index(corner)
+
+    def corner(self, corner) -> np.ndarray:
+        """Returns [delay_id, rise/fall, min/typ/max] view for one corner."""
+        return self.values[self.corner_index(corner)]
+
+    def column(self, name) -> np.ndarray:
+        """Returns [corner, rise/fall, min/typ/max] view for one delay."""
+        return self.values[:, self.ids[name]]
+
+    def select(self, names) -> np.ndarray:
+        """Returns [corner, len(names), rise/fall, min/typ/max] for given delay names."""
+        return self.values[:, [self.ids[name] for name in names]]
+
+    def diff(self, corner_a, corner_b) -> np.ndarray:
+        """Returns corner_b - corner_a for delays present in both, zero elsewhere."""
+        a = self.corner_index(corner_a)
+        b = self.corner_index(corner_b)
+        both = self.present[a] & self.present[b]
+        return np.where(both[:, None, None], self.values[b] - self.values[a], 0)
+
+    def add_corner(self, name, values, present) -> None:
+        """Appends corner with given [delay_id, rise/fall, min/typ/max] values."""
+        if name in self.corners:
+            raise ValueError(f"Corner {name} already exists")
+        values = np.where(present[:, None, None], values, NOT_CONNECTED).astype(np.int32)
+        self.corners.append(name)
+        self.values = np.concatenate((self.values, values[None]))
+        self.present = np.concatenate((self.present, present[None]))
+
+    # Derived corners. factor, margin and t can be scalar or broadcastable
+    # to [rise/fall, min/typ/max], e.g. to derate only max column.
+
+    def scale(self, name, corner, factor) -> None:
+        c = self.corner_index(corner)
+        self.add_corner(name, np.rint(self.values[c] * np.asarray(factor)), self.present[c])
+
+    def add_margin(self, name, corner, margin) -> None:
+        c = self.corner_index(corner)
+        self.add_corner(name, np.rint(self.values[c] + np.asarray(margin)), self.present[c])
+
+    def maximum(self, name, corner_a, corner_b) -> None:
+        a = self.corner_index(corner_a)
+        b = self.corner_index(corner_b)
+        self.add_corner(name, np.maximum(self.values[a], self.values[b]), self.present[a] & self.present[b])
+
+    def minimum(self, name, corner_a, corner_b) -> None:
+        a = self.corner_index(corner_a)
+        b = self.corner_index(corner_b)
+        self.add_corner(name, np.minimum(self.values[a], self.values[b]), self.present[a] & self.present[b])
+
+    def blend(self, name, corner_a, corner_b, t) -> None:
+        """Adds corner interpolated between corner_a (t=0) and corner_b (t=1)."""
+        a = self.corner_index(corner_a)
+        b = self.corner_index(corner_b)
+        va = self.values[a].astype(np.float64)
+        vb = self.values[b]
+        self.add_corner(name, np.rint(va + (vb - va) * np.asarray(t)), self.present[a] & self.present[b])
+
+    def timings(self, corner) -> Dict[str, chip.Timing]:
+        """Returns delays of corner in same form as chip.get_timings."""
+        c = self.corner_index(corner)
+        idx = np.flatnonzero(self.present[c])
+        return chip.unflatten_timings([self.names[i] for i in idx], self.values[c, idx].ravel().tolist())
@@ -0,0 +1,132 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import sys
+import chip
+from array import array
+from math import prod
+from typing import Optional
+from timing import NOT_CONNECTED, SPARSE_SECTION_SHAPES, decompress_timing
+
+class DelayTable:
+    """Indexed view on one T_delay section of timing data.
+
+    Entries are addressed by same indices as used in delay names and
+    located by index arithmetic only, nothing is decoded up front.
+    Subclasses define SECTION and position() mapping those indices to
+    zero based position in section array.
+    """
+    SECTION = None
+
+    def __init__(self, data, palette=None):
+        self.shape = SPARSE_SECTION_SHAPES[self.SECTION]
+        values = memoryview(data).cast('i')
+        if sys.byteorder != 'little':
+            values = array('i', values)
+            values.byteswap()
+        if len(values) != prod(self.shape) * 6:
+            raise ValueError(f"Invalid size of {self.SECTION} data")
+        self.values = values
+        self.palette = chip.TimingPalette() if palette is None else palette
+        self.strides = []
+        stride = 6
+        for n in reversed(self.shape):
+            self.strides.insert(0, stride)
+            stride *= n
+
+    @classmethod
+    def from_record(cls, timing_data, palette=None):
+        """Creates table from lazy Tdel_all_rec, e.g. decompress_timing(path, lazy=True)."""
+        return cls(timing_data.section_data(cls.SECTION), palette)
+
+    @classmethod
+    def load(cls, name, palette=None):
+        """Creates table for timing corner, e.g. "worst_spd"."""
+        return cls.from_record(decompress_timing(chip.get_dly_path(name), lazy=True), palette)
+
+    def position(self, *idx) -> tuple:
+        return idx
+
+    def offset(self, *idx) -> int:
+        pos = self.position(*idx)
+        offset = 0
+        for i, n, stride in zip(pos, self.shape, self.strides):
+            if not 0 <= i < n:
+                raise IndexError(f"{self.__class__.__name__} index {idx} out of range")
+            offset += i * stride
+        return offset
+
+    def raw(self, *idx):
+        """Returns rise min/typ/max and fall min/typ/max as int view into data."""
+        offset = self.offset(*idx)
+        return self.values[offset:offset + 6]
+
+    def is_connected(self, *idx) -> bool:
+        return self.values[self.offset(*idx)] != NOT_CONNECTED
+
+    def get(self, *idx) -> Optional[chip.Timing]:
+        """Returns shared Timing for entry, or None if not connected."""
+        offset = self.offset(*idx)
+        v = tuple(self.values[offset:offset + 6])
+        if v[0] == NOT_CONNECTED:
+            return None
+        return self.palette.get(v)
+
+    def __getitem__(self, idx) -> chip.Timing:
+        t = self.get(*idx)
+        if t is None:
+            raise KeyError(idx)
+        return t
+
+class SBDelayTable(DelayTable):
+    """Switch box delays, indexed as sb_del_t{tile}_x{x}_y{y}_p{plane}_d{input}_s{select}."""
+    SECTION = "SB_del_tile_arr"
+
+    def position(self, tile, x, y, plane, input, select):
+        # Switch boxes are on odd x/y or even x/y only
+        if (x + y) % 2 != 0:
+            raise IndexError(f"No switch box at x{x} y{y}")
+        return (tile - 1, x - 1, (y - 1) // 2, plane - 1, input, select)
+
+class InMuxDelayTable(DelayTable):
+    """Input mux delays, indexed as im_x{x}_y{y}_p{plane}_d{input}_path{path}."""
+    SECTION = "IM_del_tile_arr"
+
+    def position(self, x, y, plane, input, path):
+        return (path - 1, x - 1, y - 1, plane - 1, input)
+
+class OutMuxDelayTable(DelayTable):
+    """Output mux delays, indexed as om_x{x}_y{y}_p{plane}_d{input}, plane being 9..12."""
+    SECTION = "OM_del_tile_arr"
+
+    def position(self, x, y, plane, input):
+        return (x - 1, y - 1, plane - 9, input)
+
+class RimDelayTable(DelayTable):
+    """Rim switch box delays, indexed as sb_rim_xy{xy}_s{side}_p{plane}_d{input}_s{select}."""
+    SECTION = "SB_del_rim_arr"
+
+    def position(self, xy, side, plane, input, select):
+        return (xy + 2, side - 1, plane - 1, input, select)
+
+class EdgeDelayTable(DelayTable):
+    """Edge delays, indexed by xy, side and input (1..24) and output (1..8) number."""
+    SECTION = "Edge_del_arr"
+
+    def position(self, xy, side, input, output):
+        return (xy + 2, side - 1, input - 1, output - 1)
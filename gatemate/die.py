@@ -4276,24 +4276,49 @@ class Die:
         self.create_conn(PLL_X_POS, PLL_Y_POS, "GLBOUT.GLB2", x, y, "RAM.CLOCK3")
         self.create_conn(PLL_X_POS, PLL_Y_POS, "GLBOUT.GLB3", x, y, "RAM.CLOCK4")
 
+    def create_tile_connections(self, x, y):
+        if is_cpe(x,y):
+            self.create_cpe(x,y)
+            self.create_inmux(x,y)
+            if is_outmux(x,y):
+                self.create_outmux(x,y)
+        if is_sb(x,y):
+            self.create_sb(x,y)
+        if is_edge_io(x,y):
+            self.create_io(x,y)
+        if is_ram_u(x,y):
+            self.create_ram(x,y)
+        if is_serdes(x,y):
+            self.create_serdes(x,y)
+
     def create_in_die_connections(self, conn):
         self.conn = conn
         for y in range(-2, max_row()+1):
             for x in range(-2, max_col()+1):
-                if is_cpe(x,y):
-                    self.create_cpe(x,y)
-                    self.create_inmux(x,y)
-                    if is_outmux(x,y):
-                        self.create_outmux(x,y)
-                if is_sb(x,y):
-                    self.create_sb(x,y)
-                if is_edge_io(x,y):
-                    self.create_io(x,y)
-                if is_ram_u(x,y):
-                    self.create_ram(x,y)
-                if is_serdes(x,y):
-                    self.create_serdes(x,y)
+                self.create_tile_connections(x,y)
         self.create_pll()
         self.global_mesh()
         self.edge_select()
         self.misc_connections()
+
+    def iter_in_die_connections(self):
+        """Yields same connections as create_in_die_connections as (src, [dst...]).
+
+        Connections are yielded tile by tile, followed by die wide ones, so
+        same source can be in more than one group. Only connections of
+        current tile are kept in memory. Lookups by get_connections_for and
+        get_connections_to are not affected, also after early stop.
+        """
+        steps = [ (lambda x=x, y=y: self.create_tile_connections(x,y)) for y in range(-2, max_row()+1) for x in range(-2, max_col()+1) ]
+        steps += [ self.create_pll, self.global_mesh, self.edge_select, self.misc_connections ]
+        conn, rev_conn = self.conn, self.rev_conn
+        self.rev_conn = dict()
+        try:
+            for step in steps:
+                self.conn = dict()
+                step()
+                for items in self.conn.values():
+                    yield items[0], items[1:]
+                self.rev_conn.clear()
+        finally:
+            self.conn, self.rev_conn = conn, rev_conn
@@ -0,0 +1,178 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+# On-disk cache of RoutingGraph per device.
+#
+# File layout (little-endian):
+#   header    magic "GMRG", format version, 32 byte key, number of
+#             source nodes, key dimensions, number of sections
+#   sections  per section name (16 bytes), numpy dtype (8 bytes),
+#             offset and number of items (uint64)
+#   data      8 byte aligned section data; wire and delay names are
+#             stored newline separated, DDR input locations of dies
+#             (Die.ddr_i) as newline separated "die/bank" names and
+#             int32 x, y, z per name
+#
+# Key is SHA-256 over device name, DATABASE_VERSION and content of the
+# modules generating connections, so any change to them invalidates
+# cached files.
+
+import os
+import time
+import mmap
+import struct
+import hashlib
+import numpy as np
+import chip
+import cache_file
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from die import Location
+from routing_graph import RoutingGraph, get_routing_graph
+
+CACHE_ENV = "PEPPERCORN_GRAPH_CACHE"
+MAGIC = b"GMRG"
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sI32sQ3II')
+SECTION = struct.Struct('<16s8sQQ')
+ARRAYS = ("keys", "indptr", "dst", "delay_class")
+SOURCES = ("die.py", "chip.py", "routing_graph.py")
+
+@dataclass
+class CacheStats:
+    hits : int = 0
+    misses : int = 0
+    load_time : float = 0.0
+    build_time : float = 0.0
+    bytes_written : int = 0
+
+stats = CacheStats()
+
+def get_cache_dir(cache_dir=None) -> Optional[str]:
+    return cache_file.get_cache_dir(cache_dir, CACHE_ENV)
+
+def cache_key(device) -> bytes:
+    h = hashlib.sha256()
+    h.update(f"{device}\0{chip.DATABASE_VERSION}\0{FORMAT_VERSION}".encode('ascii'))
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in SOURCES:
+        with open(os.path.join(current_dir, name), 'rb') as f:
+            h.update(b"\0" + f.read())
+    return h.digest()
+
+def get_cache_path(cache_dir, device) -> str:
+    return os.path.join(cache_dir, f"{device}_graph.cache")
+
+def encode_names(names) -> np.ndarray:
+    return np.frombuffer("\n".join(names).encode('ascii'), dtype=np.uint8)
+
+def decode_names(data) -> list:
+    return data.tobytes().decode('ascii').split("\n") if len(data) else []
+
+def store(path, key: bytes, graph: RoutingGraph, dies) -> int:
+    ddr = [(f"{d.name}/{bank}", loc) for d in dies.values() for bank, loc in d.ddr_i.items()]
+    sections = [(name, getattr(graph, name)) for name in ARRAYS]
+    sections += [(name, encode_names(getattr(graph, name))) for name in ("wires", "delays")]
+    sections.append(("ddr_names", encode_names(name for name, _ in ddr)))
+    sections.append(("ddr_loc", np.array([(loc.x, loc.y, loc.z) for _, loc in ddr], dtype=np.int32).reshape(-1)))
+    offset = HEADER.size + len(sections) * SECTION.size
+    table = []
+    for name, data in sections:
+        offset = (offset + 7) & ~7
+        table.append(SECTION.pack(name.encode('ascii'), data.dtype.newbyteorder('<').str.encode('ascii'), offset, len(data)))
+        offset += data.nbytes
+
+    with cache_file.write_atomic(path) as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, key, graph.num_sources, *graph.key_dims, len(sections)))
+        f.write(b"".join(table))
+        for (_, data), entry in zip(sections, table):
+            f.write(bytes(SECTION.unpack(entry)[2] - f.tell()))
+            f.write(data.astype(data.dtype.newbyteorder('<'), copy=False).tobytes())
+    return offset
+
+def load(path, key: bytes) -> Optional[Tuple[RoutingGraph, Dict[str,Dict[str,Location]]]]:
+    """Returns (graph, ddr_i per die), or None if file is missing or stale.
+
+    Graph arrays are mapped from file.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        result = read_mapped(mm, key)
+    except (ValueError, KeyError, struct.error):
+        result = None
+    # Arrays viewing mm are gone with read_mapped frame, so it can be closed
+    if result is None:
+        mm.close()
+    return result
+
+def read_mapped(mm, key: bytes) -> Optional[Tuple[RoutingGraph, Dict[str,Dict[str,Location]]]]:
+    if len(mm) < HEADER.size:
+        return None
+    magic, version, file_key, num_sources, width, height, num_wires, count = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != FORMAT_VERSION or file_key != key:
+        return None
+    data = dict()
+    for i in range(count):
+        name, dtype, offset, items = SECTION.unpack_from(mm, HEADER.size + i * SECTION.size)
+        dtype = np.dtype(dtype.rstrip(b"\0").decode('ascii'))
+        if offset + items * dtype.itemsize > len(mm):
+            return None
+        data[name.rstrip(b"\0").decode('ascii')] = np.frombuffer(mm, dtype=dtype, count=items, offset=offset)
+    wires, delays = (decode_names(data[name]) for name in ("wires", "delays"))
+    ddr_i = dict()
+    for name, (x, y, z) in zip(decode_names(data["ddr_names"]), data["ddr_loc"].reshape(-1, 3).tolist()):
+        die, bank = name.split("/")
+        ddr_i.setdefault(die, dict())[bank] = Location(x, y, z)
+    graph = RoutingGraph(*(data[name] for name in ARRAYS[:1]), num_sources, *(data[name] for name in ARRAYS[1:]),
+                         (width, height, num_wires), wires, delays)
+    return graph, ddr_i
+
+def get_cached_routing_graph(device, cache_dir=None, rebuild=False) -> RoutingGraph:
+    """Returns RoutingGraph of device, loaded from cache directory if possible.
+
+    Graph is built and stored if there is no valid cached file or
+    rebuild is set. Without cache directory graph is always built.
+    Either way ddr_i of device dies is set, as building graph does.
+    """
+    dev = chip.get_device(device)
+    cache_dir = get_cache_dir(cache_dir)
+    key = path = None
+    if cache_dir is not None:
+        key = cache_key(device)
+        path = get_cache_path(cache_dir, device)
+        if not rebuild:
+            start = time.perf_counter()
+            cached = load(path, key)
+            if cached is not None:
+                graph, ddr_i = cached
+                for name, banks in ddr_i.items():
+                    dev.dies[name].ddr_i = banks
+                stats.hits += 1
+                stats.load_time += time.perf_counter() - start
+                return graph
+    stats.misses += 1
+    start = time.perf_counter()
+    graph = get_routing_graph(dev)
+    stats.build_time += time.perf_counter() - start
+    if path is not None:
+        stats.bytes_written += store(path, key, graph, dev.dies)
+    return graph
@@ -0,0 +1,71 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import numpy as np
+import chip
+from dataclasses import dataclass
+from typing import List
+from timing import NOT_CONNECTED, decompress_timing
+
+# IO_SEL_io_coef holds [1..4][1..27] scaling factors applied to IO buffer
+# delays. Unused entries are zero. Meaning of rows and columns in terms
+# of IO configuration (drive strength, slew rate, voltage) is not
+# documented, so entries are addressed by (row, column) index here.
+IO_COEF_ROWS = 4
+IO_COEF_COLUMNS = 27
+
+@dataclass
+class IODelayModel:
+    coef : np.ndarray
+
+    @staticmethod
+    def from_record(timing_data) -> 'IODelayModel':
+        return IODelayModel(np.array(timing_data.IO_SEL_io_coef, dtype=np.float64))
+
+    @staticmethod
+    def load(name) -> 'IODelayModel':
+        """Creates model for timing corner, e.g. "worst_spd"."""
+        return IODelayModel.from_record(decompress_timing(chip.get_dly_path(name), lazy=True))
+
+    def factors(self, row, column) -> np.ndarray:
+        """Returns coefficients for arrays of zero based row and column indices."""
+        return self.coef[np.asarray(row), np.asarray(column)]
+
+    def evaluate(self, base, row, column) -> np.ndarray:
+        """Scales base delays by coefficients of each IO configuration.
+
+        base is Timing or int array [..., rise/fall, min/typ/max] and is
+        broadcast against row and column, which are flattened in C order.
+        Returns int32 array shaped [N, rise/fall, min/typ/max],
+        configurations with unused (zero) coefficient are set to
+        NOT_CONNECTED.
+        """
+        if isinstance(base, chip.Timing):
+            base = base.as_tuple()
+        base = np.asarray(base, dtype=np.float64).reshape(-1, 2, 3)
+        f = self.factors(row, column).reshape(-1)[:, None, None]
+        result = np.rint(base * f).astype(np.int32)
+        result[np.broadcast_to(f == 0.0, result.shape)] = NOT_CONNECTED
+        return result
+
+    def timings(self, base, row, column, palette=None) -> List[chip.Timing]:
+        """Same as evaluate, returning one shared Timing per configuration."""
+        if palette is None:
+            palette = chip.TimingPalette()
+        values = self.evaluate(base, row, column).reshape(-1, 6)
+        return [palette.get(v) for v in map(tuple, values.tolist())]
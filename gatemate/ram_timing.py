@@ -0,0 +1,73 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+import chip
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from timing import Tdel_entry, decompress_timing
+
+# RAM modes in same order and naming as RAM_* delays of get_timings
+RAM_MODES = {
+    "NOECC" : "FPGA_ram_del_1",
+    "ECC"   : "FPGA_ram_del_2",
+    "REG"   : "FPGA_ram_del_3",
+}
+
+RAM_ARC_TABLES = ("iopath", "setuphold", "width")
+
+def index_ram_arcs(entries) -> Dict[Tuple[int,int],int]:
+    """Returns dict of (input pin, output or clock pin) to del_entry index.
+
+    First entry of table only holds number of used entries.
+    """
+    count = entries[0].pins.i
+    return { (e.pins.i, e.pins.o_or_clk) : e.entry_no for e in entries[1:count + 1] }
+
+@dataclass
+class RamTimingIndex:
+    """Timing arcs of one RAM mode, resolved by pin pair."""
+    del_entry : List[Tdel_entry]
+    timings : List[chip.Timing]
+    iopath : Dict[Tuple[int,int],int]
+    setuphold : Dict[Tuple[int,int],int]
+    width : Dict[Tuple[int,int],int]
+
+    @staticmethod
+    def from_record(ram, palette=None) -> 'RamTimingIndex':
+        if palette is None:
+            palette = chip.TimingPalette()
+        timings = [palette.intern(chip.convert_ram_delay(e)) for e in ram.del_entry]
+        return RamTimingIndex(ram.del_entry, timings, *(index_ram_arcs(getattr(ram, table)) for table in RAM_ARC_TABLES))
+
+    def entry(self, table, i, o_or_clk) -> Tdel_entry:
+        """Returns delay entry of arc, raises KeyError if arc does not exist."""
+        return self.del_entry[getattr(self, table)[(i, o_or_clk)]]
+
+    def timing(self, table, i, o_or_clk) -> chip.Timing:
+        return self.timings[getattr(self, table)[(i, o_or_clk)]]
+
+def build_ram_timings(timing_data, palette=None) -> Dict[str,RamTimingIndex]:
+    if palette is None:
+        palette = chip.TimingPalette()
+    return { mode : RamTimingIndex.from_record(getattr(timing_data, section), palette) for mode, section in RAM_MODES.items() }
+
+@lru_cache(maxsize=len(chip.TIMING_CORNERS))
+def get_ram_timings(name) -> Dict[str,RamTimingIndex]:
+    """Returns dict of RAM mode to RamTimingIndex for timing corner, built once per corner."""
+    return build_ram_timings(decompress_timing(chip.get_dly_path(name), lazy=True))
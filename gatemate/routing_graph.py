@@ -0,0 +1,338 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+# Connections of chip as integer arrays instead of Connection objects.
+#
+# All dies have the same connection pattern, so it is generated once for
+# die at origin (template) and placed at each die by adding its offset.
+
+import numpy as np
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from dataclasses import dataclass, field
+from functools import cache
+from math import prod
+from typing import Dict, List, Tuple
+from die import Die, Location, Connection
+
+class StringTable:
+    """Assigns consecutive ids to names, in order of first use."""
+    def __init__(self):
+        self.names = []
+        self.ids = dict()
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name) -> int:
+        idx = self.ids.get(name)
+        if idx is None:
+            idx = len(self.names)
+            self.ids[name] = idx
+            self.names.append(name)
+        return idx
+
+    def copy(self) -> 'StringTable':
+        table = StringTable()
+        table.names = list(self.names)
+        table.ids = dict(self.ids)
+        return table
+
+EDGE_COLUMNS = ("src_x", "src_y", "src_wire", "dst_x", "dst_y", "dst_wire", "delay")
+
+@dataclass
+class EdgeList:
+    """Connections in creation order, one int32 array per column.
+
+    Wire and delay columns are indices into wires and delays name tables,
+    which are shared by all edge lists derived from same template.
+    """
+    src_x : np.ndarray
+    src_y : np.ndarray
+    src_wire : np.ndarray
+    dst_x : np.ndarray
+    dst_y : np.ndarray
+    dst_wire : np.ndarray
+    delay : np.ndarray
+    wires : StringTable
+    delays : StringTable
+
+    def __len__(self):
+        return len(self.src_x)
+
+    def relocate(self, offset_x, offset_y, wires=None, delays=None) -> 'EdgeList':
+        """Returns edges moved by offset, wire and delay columns are shared.
+
+        Name tables are shared too, unless extended copies are given.
+        """
+        return EdgeList(self.src_x + offset_x, self.src_y + offset_y, self.src_wire,
+                        self.dst_x + offset_x, self.dst_y + offset_y, self.dst_wire,
+                        self.delay, self.wires if wires is None else wires,
+                        self.delays if delays is None else delays)
+
+    @staticmethod
+    def concatenate(parts) -> 'EdgeList':
+        wires, delays = parts[0].wires, parts[0].delays
+        if any(p.wires is not wires or p.delays is not delays for p in parts):
+            raise ValueError("Edge lists use different name tables")
+        return EdgeList(*(np.concatenate([getattr(p, c) for p in parts]) for c in EDGE_COLUMNS), wires, delays)
+
+    def source_keys(self) -> np.ndarray:
+        return (self.src_x.astype(np.int64) + 2) << 40 | (self.src_y.astype(np.int64) + 2) << 24 | self.src_wire
+
+    def connections(self):
+        """Returns connections in same form as Chip.get_connections."""
+        keys = self.source_keys()
+        _, first, group = np.unique(keys, return_index=True, return_inverse=True)
+        # Number groups by first use and sort edges by group keeping creation order
+        rank = np.empty(len(first), dtype=np.int64)
+        rank[np.argsort(first, kind='stable')] = np.arange(len(first))
+        order = np.argsort(rank[group], kind='stable')
+        wires, delays = self.wires.names, self.delays.names
+        columns = [getattr(self, c)[order].tolist() for c in EDGE_COLUMNS]
+        conn = dict()
+        current = None
+        for src_x, src_y, src_wire, dst_x, dst_y, dst_wire, delay in zip(*columns):
+            src = wires[src_wire]
+            if (src_x, src_y, src_wire) != current:
+                current = (src_x, src_y, src_wire)
+                items = [Connection(src_x, src_y, src, "", False)]
+                conn[f"{src_x}/{src_y}/{src}"] = items
+            items.append(Connection(dst_x, dst_y, wires[dst_wire], delays[delay], True))
+        return conn.items()
+
+class EdgeRecorder(Die):
+    """Die recording create_conn calls into integer columns."""
+    def __init__(self, name : str, die_x : int, die_y : int, wires=None, delays=None):
+        super().__init__(name, die_x, die_y)
+        self.wires = StringTable() if wires is None else wires
+        self.delays = StringTable() if delays is None else delays
+        self.columns = tuple(array('i') for _ in EDGE_COLUMNS)
+
+    def create_conn(self, src_x,src_y, src, dst_x, dst_y, dst, delay="del_dummy"):
+        intern = self.wires.intern
+        c = self.columns
+        c[0].append(src_x + self.offset_x)
+        c[1].append(src_y + self.offset_y)
+        c[2].append(intern(src))
+        c[3].append(dst_x + self.offset_x)
+        c[4].append(dst_y + self.offset_y)
+        c[5].append(intern(dst))
+        c[6].append(self.delays.intern(delay))
+
+    def record(self, connections):
+        """Records (src_x, src_y, src, dst_x, dst_y, dst, delay) tuples."""
+        for c in connections:
+            self.create_conn(*c)
+
+    def edges(self) -> EdgeList:
+        return EdgeList(*(np.frombuffer(c, dtype=np.int32) for c in self.columns), self.wires, self.delays)
+
+@dataclass
+class ConnectionTemplate:
+    """In-die connections of die at origin."""
+    edges : EdgeList
+    ddr_i : Dict[str,Location]
+
+@cache
+def get_connection_template() -> ConnectionTemplate:
+    recorder = EdgeRecorder("template", 0, 0)
+    recorder.create_in_die_connections(None)
+    return ConnectionTemplate(recorder.edges(), recorder.ddr_i)
+
+def get_chip_edges(chip) -> EdgeList:
+    """Returns all connections of chip, same as Chip.get_connections but as arrays.
+
+    Also sets ddr_i of dies, as Die.create_in_die_connections does.
+    """
+    template = get_connection_template()
+    # Cross die names are added to copies, so cached template does not
+    # depend on devices built before
+    wires, delays = template.edges.wires.copy(), template.edges.delays.copy()
+    parts = []
+    for d in chip.dies.values():
+        parts.append(template.edges.relocate(d.offset_x, d.offset_y, wires, delays))
+        d.ddr_i = { bank : Location(loc.x + d.offset_x, loc.y + d.offset_y, loc.z) for bank, loc in template.ddr_i.items() }
+    # Cross die connections use absolute coordinates
+    stitch = EdgeRecorder("d2d", 0, 0, wires, delays)
+    stitch.record(chip.d2d_connections())
+    parts.append(stitch.edges())
+    return EdgeList.concatenate(parts)
+
+def record_die_edges(name, die_x, die_y):
+    """Generates connections of one die in worker process.
+
+    Columns are returned in shared memory block as int32 [column][edge],
+    caller has to unlink it. Block stays registered with resource tracker
+    shared with caller, which removes it if caller exits without doing so.
+    """
+    recorder = EdgeRecorder(name, die_x, die_y)
+    recorder.create_in_die_connections(None)
+    count = len(recorder.columns[0])
+    shm = SharedMemory(create=True, size=max(len(EDGE_COLUMNS) * count * 4, 1))
+    data = np.ndarray((len(EDGE_COLUMNS), count), dtype=np.int32, buffer=shm.buf)
+    for i, c in enumerate(recorder.columns):
+        data[i] = np.frombuffer(c, dtype=np.int32)
+    del data
+    shm.close()
+    return shm.name, count, recorder.wires.names, recorder.delays.names, recorder.ddr_i
+
+def unlink_block(name):
+    shm = SharedMemory(name=name)
+    shm.close()
+    shm.unlink()
+
+def build_chip_edges(chip, workers=None) -> EdgeList:
+    """Same as get_chip_edges, but generating each die in own worker process."""
+    wires, delays = StringTable(), StringTable()
+    dies = list(chip.dies.values())
+    parts = []
+    futures = []
+    # Started before workers so they share it instead of each starting own
+    # one, which would remove their blocks as soon as they exit
+    resource_tracker.ensure_running()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [ executor.submit(record_die_edges, d.name, d.die_x, d.die_y) for d in dies ]
+            wait(futures)
+        for d, future in zip(dies, futures):
+            shm_name, count, die_wires, die_delays, d.ddr_i = future.result()
+            shm = SharedMemory(name=shm_name)
+            try:
+                data = np.ndarray((len(EDGE_COLUMNS), count), dtype=np.int32, buffer=shm.buf)
+                # Worker numbered names on its own, map them to common tables
+                wire_map = np.array([wires.intern(name) for name in die_wires], dtype=np.int32)
+                delay_map = np.array([delays.intern(name) for name in die_delays], dtype=np.int32)
+                parts.append(EdgeList(data[0].copy(), data[1].copy(), wire_map[data[2]],
+                                      data[3].copy(), data[4].copy(), wire_map[data[5]],
+                                      delay_map[data[6]], wires, delays))
+                del data
+            finally:
+                shm.close()
+    finally:
+        # Every block created, also when other dies failed or on interrupt
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                unlink_block(future.result()[0])
+    stitch = EdgeRecorder("d2d", 0, 0, wires, delays)
+    stitch.record(chip.d2d_connections())
+    parts.append(stitch.edges())
+    return EdgeList.concatenate(parts)
+
+@dataclass
+class RoutingGraph:
+    """Routing graph in compressed sparse row form.
+
+    Nodes are all (x, y, wire) used by connections. Nodes driving any
+    connection come first (0 .. num_sources-1), then nodes only being
+    driven, each part ordered by node key. Fan-out of source n is
+    dst[indptr[n]:indptr[n+1]] in creation order, delay_class of same
+    range indexes delays.
+
+    Node key is (x + 2, y + 2, wire) as mixed radix number with digit
+    sizes key_dims, stored as uint32 when it fits.
+    """
+    keys : np.ndarray
+    num_sources : int
+    indptr : np.ndarray
+    dst : np.ndarray
+    delay_class : np.ndarray
+    key_dims : Tuple[int,int,int]
+    wires : List[str]
+    delays : List[str]
+    wire_ids : Dict[str,int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.wire_ids = { name : i for i, name in enumerate(self.wires) }
+
+    @staticmethod
+    def from_edges(edges : EdgeList) -> 'RoutingGraph':
+        n = len(edges)
+        dims = (int(max(edges.src_x.max(), edges.dst_x.max())) + 3,
+                int(max(edges.src_y.max(), edges.dst_y.max())) + 3,
+                len(edges.wires))
+        dtype = np.uint32 if prod(dims) <= 2**32 else np.int64
+        src_keys = pack_keys(edges.src_x, edges.src_y, edges.src_wire, dims, dtype)
+        dst_keys = pack_keys(edges.dst_x, edges.dst_y, edges.dst_wire, dims, dtype)
+        sources = sorted_unique(src_keys)
+        src = np.searchsorted(sources, src_keys)
+        dst = np.searchsorted(sources, dst_keys)
+        is_source = sources[np.minimum(dst, len(sources) - 1)] == dst_keys
+        sinks = sorted_unique(dst_keys[~is_source])
+        keys = np.concatenate((sources, sinks))
+        dst[~is_source] = len(sources) + np.searchsorted(sinks, dst_keys[~is_source])
+
+        order = np.argsort(src, kind='stable')
+        indptr = np.zeros(len(sources) + 1, dtype=np.int32 if n < 2**31 else np.int64)
+        np.cumsum(np.bincount(src, minlength=len(sources)), out=indptr[1:])
+        delay_class = edges.delay[order].astype(np.uint8 if len(edges.delays) <= 256 else np.int16)
+        return RoutingGraph(keys, len(sources), indptr, dst[order].astype(np.int32), delay_class,
+                            dims, list(edges.wires.names), list(edges.delays.names))
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.dst)
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + self.indptr.nbytes + self.dst.nbytes + self.delay_class.nbytes
+
+    def node_id(self, x, y, wire) -> int:
+        """Returns node for wire name at location, raises KeyError if not in graph."""
+        w = self.wire_ids.get(wire)
+        if w is not None and -2 <= x < self.key_dims[0] - 2 and -2 <= y < self.key_dims[1] - 2:
+            key = pack_keys(x, y, w, self.key_dims, self.keys.dtype)
+            for start, end in ((0, self.num_sources), (self.num_sources, len(self.keys))):
+                n = start + int(np.searchsorted(self.keys[start:end], key))
+                if n < end and self.keys[n] == key:
+                    return n
+        raise KeyError((x, y, wire))
+
+    def node(self, n):
+        """Returns (x, y, wire name) of node."""
+        key = int(self.keys[n])
+        _, height, num_wires = self.key_dims
+        return key // (height * num_wires) - 2, key // num_wires % height - 2, self.wires[key % num_wires]
+
+    def fanout(self, n) -> np.ndarray:
+        if n >= self.num_sources:
+            return self.dst[:0]
+        return self.dst[self.indptr[n]:self.indptr[n + 1]]
+
+    def fanout_delays(self, n) -> np.ndarray:
+        if n >= self.num_sources:
+            return self.delay_class[:0]
+        return self.delay_class[self.indptr[n]:self.indptr[n + 1]]
+
+def sorted_unique(a) -> np.ndarray:
+    a = np.sort(a)
+    return a[np.concatenate(([True], a[1:] != a[:-1]))]
+
+def pack_keys(x, y, wire, dims, dtype) -> np.ndarray:
+    _, height, num_wires = dims
+    x = (np.asarray(x) + 2).astype(dtype)
+    y = (np.asarray(y) + 2).astype(dtype)
+    return (x * height + y) * num_wires + np.asarray(wire).astype(dtype)
+
+def get_routing_graph(chip) -> RoutingGraph:
+    return RoutingGraph.from_edges(get_chip_edges(chip))
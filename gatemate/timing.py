@@ -16,11 +16,33 @@
 #  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 #
 
+import os
 import zlib
+import mmap
 import struct
+from array import array
+from bisect import bisect_left
+from itertools import compress, product
+from math import prod
 from dataclasses import dataclass
 from typing import List
 
+NOT_CONNECTED = 123456
+
+T_DELAY_SIZE = 24
+TDEL_REC_SIZE = 80
+TDEL_REC_TRI_SIZE = 48
+TENTRY_REC_SIZE = 6
+TDEL_ENTRY_SIZE = 36
+
+# Precompiled layouts of fixed size records
+T_DELAY_TRI_STRUCT = struct.Struct('<3i')
+T_DELAY_STRUCT = struct.Struct('<6i')
+TDEL_REC_STRUCT = struct.Struct('<6iiB23s6iB3x')   # name is string[22] plus alignment
+TDEL_REC_TRI_STRUCT = struct.Struct('<3iiB23s2i')
+TENTRY_REC_STRUCT = struct.Struct('<3h')
+TDEL_ENTRY_STRUCT = struct.Struct('<9i')
+
 @dataclass
 class T_delay_tri:
     min: int
@@ -29,7 +51,7 @@ class T_delay_tri:
 
     @staticmethod
     def from_bytes(data: bytes) -> 'T_delay_tri':
-        min_val, typ_val, max_val = struct.unpack('<3i', data)
+        min_val, typ_val, max_val = T_DELAY_TRI_STRUCT.unpack(data)
         return T_delay_tri(min_val, typ_val, max_val)
 
 @dataclass
@@ -39,9 +61,11 @@ class T_delay:
 
     @staticmethod
     def from_bytes(data: bytes) -> 'T_delay':
-        rise = T_delay_tri.from_bytes(data[:12])
-        fall = T_delay_tri.from_bytes(data[12:24])
-        return T_delay(rise, fall)
+        return T_delay.from_values(T_DELAY_STRUCT.unpack(data))
+
+    @staticmethod
+    def from_values(v) -> 'T_delay':
+        return T_delay(T_delay_tri(v[0], v[1], v[2]), T_delay_tri(v[3], v[4], v[5]))
 
 @dataclass
 class Tpin_pair:
@@ -86,24 +110,14 @@ class Tdel_rec:
 
     @staticmethod
     def from_bytes(data: memoryview, offset: int) -> ('Tdel_rec', int):
-        val = T_delay.from_bytes(data[offset:offset + 24])
-        offset += 24
-
-        conf_mux = struct.unpack_from('<i', data, offset)[0]
-        offset += 4
-        strlen = data[offset]
-        offset += 1
-        name = data[offset:offset + strlen].decode('ascii')
-        offset += 23  # alignment added as well
+        return Tdel_rec.from_values(TDEL_REC_STRUCT.unpack_from(data, offset)), offset + TDEL_REC_SIZE
 
-        x, y, plane, dir, inv, cnt = struct.unpack_from('<6i', data, offset)
-        offset += 24
-
-        con_type_val = data[offset]
-        offset += 4
+    @staticmethod
+    def from_values(v) -> 'Tdel_rec':
+        r_min, r_typ, r_max, f_min, f_typ, f_max, conf_mux, strlen, name, x, y, plane, dir, inv, cnt, con_type = v
+        return Tdel_rec(T_delay(T_delay_tri(r_min, r_typ, r_max), T_delay_tri(f_min, f_typ, f_max)),
+                        conf_mux, name[:strlen].decode('ascii'), x, y, plane, dir, inv, cnt, con_type)
 
-        return Tdel_rec(val, conf_mux, name, x, y, plane, dir, inv, cnt, con_type_val), offset
-    
 @dataclass
 class Tdel_rec_tri:
     val: T_delay_tri
@@ -114,50 +128,29 @@ class Tdel_rec_tri:
 
     @staticmethod
     def from_bytes(mv: memoryview, offset: int) -> ('Tdel_rec_tri', int):
-        val = T_delay_tri.from_bytes(mv[offset:offset+12])
-        offset += 12
-
-        conf_mux = struct.unpack_from('<i', mv, offset)[0]
-        offset += 4
-
-        strlen = mv[offset]
-        offset += 1
-        name = mv[offset:offset + strlen].decode('ascii')
-        offset += 23
-
-        x, y = struct.unpack_from('<2i', mv, offset)
-        offset += 8
-
-        return Tdel_rec_tri(val, conf_mux, name, x, y), offset
-
+        min_val, typ_val, max_val, conf_mux, strlen, name, x, y = TDEL_REC_TRI_STRUCT.unpack_from(mv, offset)
+        return Tdel_rec_tri(T_delay_tri(min_val, typ_val, max_val), conf_mux, name[:strlen].decode('ascii'), x, y), offset + TDEL_REC_TRI_SIZE
+
+def iter_unpack_from(layout: struct.Struct, mv: memoryview, offset: int, count: int):
+    """Unpacks count consecutive records of given layout in one pass."""
+    end = offset + count * layout.size
+    if len(mv) < end:
+        raise EOFError("Unexpected end of data")
+    return layout.iter_unpack(memoryview(mv)[offset:end])
+
+def nest(items: List, shape) -> List:
+    """Splits flat list into nested lists of given shape (row-major)."""
+    for n in reversed(shape[1:]):
+        items = [items[i:i + n] for i in range(0, len(items), n)]
+    return items
+
+def read_delay_arr_from_bytes(mv: memoryview, offset: int, shape) -> (List, int):
+    count = prod(shape)
+    items = list(map(T_delay.from_values, iter_unpack_from(T_DELAY_STRUCT, mv, offset, count)))
+    return nest(items, shape), offset + count * T_DELAY_SIZE
 
 def read_SB_del_tile_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    SB_del_tile_arr = []
-
-    for i1 in range(4):  # [1..4]
-        level1 = []
-        for i2 in range(8):  # [1..8]
-            level2 = []
-            for i3 in range(4):  # [1..4]
-                level3 = []
-                for i4 in range(12):  # [1..12]
-                    level4 = []
-                    for i5 in range(5):  # [0..4]
-                        level5 = []
-                        for i6 in range(8):  # [0..7]
-                            chunk = mv[offset:offset + 24]
-                            if len(chunk) < 24:
-                                raise EOFError("Unexpected end of data")
-                            delay = T_delay.from_bytes(chunk)
-                            offset += 24
-                            level5.append(delay)
-                        level4.append(level5)
-                    level3.append(level4)
-                level2.append(level3)
-            level1.append(level2)
-        SB_del_tile_arr.append(level1)
-
-    return SB_del_tile_arr, offset
+    return read_delay_arr_from_bytes(mv, offset, (4, 8, 4, 12, 5, 8)) # [1..4][1..8][1..4][1..12][0..4][0..7]
 
 @dataclass
 class ExtraTimingDelays:
@@ -325,180 +318,79 @@ class ExtraTimingDelays:
         ), offset
 
 def read_IM_del_tile_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    result = []
-    for i1 in range(2):  # [1..2]
-        level1 = []
-        for i2 in range(8):  # [1..8]
-            level2 = []
-            for i3 in range(8):  # [1..8]
-                level3 = []
-                for i4 in range(12):  # [1..12]
-                    level4 = []
-                    for i5 in range(8):  # [0..7]
-                        delay = T_delay.from_bytes(mv[offset:offset+24])
-                        offset += 24
-                        level4.append(delay)
-                    level3.append(level4)
-                level2.append(level3)
-            level1.append(level2)
-        result.append(level1)
-    return result, offset
+    return read_delay_arr_from_bytes(mv, offset, (2, 8, 8, 12, 8)) # [1..2][1..8][1..8][1..12][0..7]
 
 def read_OM_del_tile_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    result = []
-    for i1 in range(8):  # [1..8]
-        level1 = []
-        for i2 in range(8):  # [1..8]
-            level2 = []
-            for i3 in range(4):  # [9..12]
-                level3 = []
-                for i4 in range(4):  # [0..3]
-                    delay = T_delay.from_bytes(mv[offset:offset+24])
-                    offset += 24
-                    level3.append(delay)
-                level2.append(level3)
-            level1.append(level2)
-        result.append(level1)
-    return result, offset
+    return read_delay_arr_from_bytes(mv, offset, (8, 8, 4, 4)) # [1..8][1..8][9..12][0..3]
 
 def read_CPE_del_tile_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    result = []
-    for i1 in range(10):  # [0..9]
-        level1 = []
-        for i2 in range(19):  # [1..19]
-            level2 = []
-            for i3 in range(10):  # [1..10]
-                rec, offset = Tdel_rec.from_bytes(mv, offset)
-                level2.append(rec)
-            level1.append(level2)
-        result.append(level1)
-    return result, offset
+    shape = (10, 19, 10) # [0..9][1..19][1..10]
+    count = prod(shape)
+    items = list(map(Tdel_rec.from_values, iter_unpack_from(TDEL_REC_STRUCT, mv, offset, count)))
+    return nest(items, shape), offset + count * TDEL_REC_SIZE
 
 def read_SB_del_rim_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    result = []
-    for i1 in range(165):  # [-2..162]
-        level1 = []
-        for i2 in range(4):  # [1..4]
-            level2 = []
-            for i3 in range(12):  # [1..12]
-                level3 = []
-                for i4 in range(5):  # [0..4]
-                    level4 = []
-                    for i5 in range(8):  # [0..7]
-                        delay = T_delay.from_bytes(mv[offset:offset+24])
-                        offset += 24
-                        level4.append(delay)
-                    level3.append(level4)
-                level2.append(level3)
-            level1.append(level2)
-        result.append(level1)
-    return result, offset
+    return read_delay_arr_from_bytes(mv, offset, (165, 4, 12, 5, 8)) # [-2..162][1..4][1..12][0..4][0..7]
 
 def read_Edge_del_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    result = []
-    for i1 in range(165):  # [-2..162]
-        level1 = []
-        for i2 in range(4):  # [1..4]
-            level2 = []
-            for i3 in range(24):  # [1..24]
-                level3 = []
-                for i4 in range(8):  # [1..8]
-                    delay = T_delay.from_bytes(mv[offset:offset+24])
-                    offset += 24
-                    level3.append(delay)
-                level2.append(level3)
-            level1.append(level2)
-        result.append(level1)
-    return result, offset
+    return read_delay_arr_from_bytes(mv, offset, (165, 4, 24, 8)) # [-2..162][1..4][1..24][1..8]
 
 def read_IO_SEL_del_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    result = []
-    for i1 in range(11):  # [1..11]
-        level1 = []
-        for i2 in range(4):  # [1..4]
-            delay = T_delay.from_bytes(mv[offset:offset+24])
-            offset += 24
-            level1.append(delay)
-        result.append(level1)
-    return result, offset
+    return read_delay_arr_from_bytes(mv, offset, (11, 4)) # [1..11][1..4]
 
 def read_CLKIN_del_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    result = []
-    for i1 in range(7):
-        level1 = []
-        for i2 in range(4):
-            delay = T_delay.from_bytes(mv[offset:offset + 24])
-            offset += 24
-            level1.append(delay)
-        result.append(level1)
-    return result, offset
+    return read_delay_arr_from_bytes(mv, offset, (7, 4))
 
 def read_GLBOUT_del_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    result = []
-    for i1 in range(28):
-        level1 = []
-        for i2 in range(8):
-            delay = T_delay.from_bytes(mv[offset:offset + 24])
-            offset += 24
-            level1.append(delay)
-        result.append(level1)
-    return result, offset
+    return read_delay_arr_from_bytes(mv, offset, (28, 8))
 
 def read_PLL_del_arr_from_bytes(mv: memoryview, offset: int) -> (List, int):
-    result = []
-    for i1 in range(7):
-        level1 = []
-        for i2 in range(6):
-            delay = T_delay.from_bytes(mv[offset:offset + 24])
-            offset += 24
-            level1.append(delay)
-        result.append(level1)
-    return result, offset
+    return read_delay_arr_from_bytes(mv, offset, (7, 6))
+
+def Tentry_rec_from_values(v) -> Tentry_rec:
+    pins_i, pins_val, entry_no = v
+    return Tentry_rec(Tpin_pair(pins_i, pins_val), entry_no)
+
+def Tdel_entry_from_values(v) -> Tdel_entry:
+    key, edge1, edge2, t1_min, t1_typ, t1_max, t2_min, t2_typ, t2_max = v
+    return Tdel_entry(key, edge1, edge2, T_delay_tri(t1_min, t1_typ, t1_max), T_delay_tri(t2_min, t2_typ, t2_max))
 
 def read_Tentry_rec_from_bytes(data: memoryview, offset: int) -> ('Tentry_rec', int):
-    pins_i, pins_val, entry_no = struct.unpack_from('<3h', data, offset)
-    return Tentry_rec(Tpin_pair(pins_i, pins_val), entry_no), offset + 6
+    return Tentry_rec_from_values(TENTRY_REC_STRUCT.unpack_from(data, offset)), offset + TENTRY_REC_SIZE
 
 def read_Tdel_entry_from_bytes(data: memoryview, offset: int) -> ('Tdel_entry', int):
-    key, edge1, edge2 = struct.unpack_from('<3i', data, offset)
-    time1 = T_delay_tri.from_bytes(data[offset + 12:offset + 24])
-    time2 = T_delay_tri.from_bytes(data[offset + 24:offset + 36])
-    return Tdel_entry(key, edge1, edge2, time1, time2), offset + 36
+    return Tdel_entry_from_values(TDEL_ENTRY_STRUCT.unpack_from(data, offset)), offset + TDEL_ENTRY_SIZE
+
+def read_Tentry_rec_arr_from_bytes(count: int):
+    def read(mv: memoryview, offset: int) -> (List[Tentry_rec], int):
+        items = list(map(Tentry_rec_from_values, iter_unpack_from(TENTRY_REC_STRUCT, mv, offset, count)))
+        return items, offset + count * TENTRY_REC_SIZE
+    return read
+
+def read_Tdel_entry_arr_from_bytes(count: int):
+    def read(mv: memoryview, offset: int) -> (List[Tdel_entry], int):
+        items = list(map(Tdel_entry_from_values, iter_unpack_from(TDEL_ENTRY_STRUCT, mv, offset, count)))
+        return items, offset + count * TDEL_ENTRY_SIZE
+    return read
+
+read_iopath_from_bytes = read_Tentry_rec_arr_from_bytes(3001)
+read_setuphold_from_bytes = read_Tentry_rec_arr_from_bytes(8001)
+read_width_from_bytes = read_Tentry_rec_arr_from_bytes(51)
+read_del_entry_from_bytes = read_Tdel_entry_arr_from_bytes(101)
 
 def read_TRAM_del_rec_from_bytes(mv: memoryview, offset: int) -> (TRAM_del_rec, int):
-    iopath = []
-    for _ in range(3001):
-        entry, offset = read_Tentry_rec_from_bytes(mv, offset)
-        iopath.append(entry)
-
-    setuphold = []
-    for _ in range(8001):
-        entry, offset = read_Tentry_rec_from_bytes(mv, offset)
-        setuphold.append(entry)
-
-    width = []
-    for _ in range(51):
-        entry, offset = read_Tentry_rec_from_bytes(mv, offset)
-        width.append(entry)
-
-    del_entry = []
+    iopath, offset = read_iopath_from_bytes(mv, offset)
+    setuphold, offset = read_setuphold_from_bytes(mv, offset)
+    width, offset = read_width_from_bytes(mv, offset)
     offset += 2 # alignment added
-    for _ in range(101):
-        entry, offset = read_Tdel_entry_from_bytes(mv, offset)
-        del_entry.append(entry)
-
+    del_entry, offset = read_del_entry_from_bytes(mv, offset)
     return TRAM_del_rec(iopath, setuphold, width, del_entry), offset
 
+IO_SEL_IO_COEF_STRUCT = struct.Struct('<108d') # [1..4][1..27]
+
 def read_IO_SEL_io_coef_from_bytes(mv: memoryview, offset: int) -> (list, int):
-    result = []
-    for i1 in range(4):  # [1..4]
-        row = []
-        for i2 in range(27):  # [1..27]
-            value = struct.unpack_from('<d', mv, offset)[0]  # '<d' = little-endian double
-            offset += 8
-            row.append(value)
-        result.append(row)
-    return result, offset
+    values = list(IO_SEL_IO_COEF_STRUCT.unpack_from(mv, offset))
+    return nest(values, (4, 27)), offset + IO_SEL_IO_COEF_STRUCT.size
 
 @dataclass
 class Tdel_all_rec:
@@ -538,17 +430,275 @@ class Tdel_all_rec:
         timing_delays, offset = ExtraTimingDelays.from_bytes(data, offset)
         return Tdel_all_rec(sb_del_tile_arr, im, om, cpe, sb_del_rim, edge, io_sel, clkin, glbout, pll_del, fpga_ram_del_1, fpga_ram_del_2, fpga_ram_del_3,io_sel_coef, timing_delays)
 
+class LazyRecord:
+    """Fixed layout record that decodes each section on first access.
+
+    SECTIONS lists (name, reader, size) in file order, reader being None
+    for alignment only. Offsets are computed once per class.
+    """
+    SECTIONS = []
+
+    def __init__(self, data, offset: int = 0):
+        self._data = data
+        self._offset = offset
 
-def decompress_timing(input_path) -> 'Tdel_all_rec':
+    def __init_subclass__(cls):
+        cls.LAYOUT = dict()
+        cls.SECTION_SIZES = dict()
+        offset = 0
+        for name, reader, size in cls.SECTIONS:
+            if reader is not None:
+                cls.LAYOUT[name] = (reader, offset)
+                cls.SECTION_SIZES[name] = size
+            offset += size
+        cls.SIZE = offset
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in self.LAYOUT:
+            raise AttributeError(name)
+        reader, offset = self.LAYOUT[name]
+        value, _ = reader(self._data, self._offset + offset)
+        setattr(self, name, value)
+        return value
+
+    @classmethod
+    def section_offset(cls, name) -> int:
+        return cls.LAYOUT[name][1]
+
+    def section_data(self, name) -> memoryview:
+        """Returns raw bytes of section without decoding it."""
+        reader, offset = self.LAYOUT[name]
+        start = self._offset + offset
+        return memoryview(self._data)[start:start + self.SECTION_SIZES[name]]
+
+    @classmethod
+    def from_bytes(cls, data, offset: int = 0):
+        if len(data) < offset + cls.SIZE:
+            raise EOFError("Unexpected end of data")
+        return cls(data, offset)
+
+class TRAM_del_rec_lazy(LazyRecord):
+    SECTIONS = [
+        ('iopath', read_iopath_from_bytes, 3001 * TENTRY_REC_SIZE),
+        ('setuphold', read_setuphold_from_bytes, 8001 * TENTRY_REC_SIZE),
+        ('width', read_width_from_bytes, 51 * TENTRY_REC_SIZE),
+        ('_align', None, 2),
+        ('del_entry', read_del_entry_from_bytes, 101 * TDEL_ENTRY_SIZE),
+    ]
+
+def read_TRAM_del_rec_lazy_from_bytes(mv: memoryview, offset: int) -> (TRAM_del_rec_lazy, int):
+    return TRAM_del_rec_lazy.from_bytes(mv, offset), offset + TRAM_del_rec_lazy.SIZE
+
+EXTRA_TIMING_DELAYS_SIZE = 8 + 96 * TDEL_REC_SIZE + 9 * TDEL_REC_TRI_SIZE
+
+class Tdel_all_rec_lazy(LazyRecord):
+    """Same attributes as Tdel_all_rec, but only sections actually used are decoded."""
+    SECTIONS = [
+        ('SB_del_tile_arr', read_SB_del_tile_arr_from_bytes, 4*8*4*12*5*8 * T_DELAY_SIZE),
+        ('IM_del_tile_arr', read_IM_del_tile_arr_from_bytes, 2*8*8*12*8 * T_DELAY_SIZE),
+        ('OM_del_tile_arr', read_OM_del_tile_arr_from_bytes, 8*8*4*4 * T_DELAY_SIZE),
+        ('CPE_del_tile_arr', read_CPE_del_tile_arr_from_bytes, 10*19*10 * TDEL_REC_SIZE),
+        ('SB_del_rim_arr', read_SB_del_rim_arr_from_bytes, 165*4*12*5*8 * T_DELAY_SIZE),
+        ('Edge_del_arr', read_Edge_del_arr_from_bytes, 165*4*24*8 * T_DELAY_SIZE),
+        ('IO_SEL_del_arr', read_IO_SEL_del_arr_from_bytes, 11*4 * T_DELAY_SIZE),
+        ('CLKIN_del_arr', read_CLKIN_del_arr_from_bytes, 7*4 * T_DELAY_SIZE),
+        ('GLBOUT_del_arr', read_GLBOUT_del_arr_from_bytes, 28*8 * T_DELAY_SIZE),
+        ('PLL_del_arr', read_PLL_del_arr_from_bytes, 7*6 * T_DELAY_SIZE),
+        ('FPGA_ram_del_1', read_TRAM_del_rec_lazy_from_bytes, TRAM_del_rec_lazy.SIZE),
+        ('FPGA_ram_del_2', read_TRAM_del_rec_lazy_from_bytes, TRAM_del_rec_lazy.SIZE),
+        ('FPGA_ram_del_3', read_TRAM_del_rec_lazy_from_bytes, TRAM_del_rec_lazy.SIZE),
+        ('IO_SEL_io_coef', read_IO_SEL_io_coef_from_bytes, 4*27 * 8),
+        ('timing_delays', ExtraTimingDelays.from_bytes, EXTRA_TIMING_DELAYS_SIZE),
+    ]
+
+@dataclass
+class SparseDelayArray:
+    """T_delay array with not connected entries left out.
+
+    mask has one byte per entry of dense array, index is flat (row-major)
+    index of each connected entry and values holds its rise min/typ/max
+    and fall min/typ/max, six int32 per entry.
+    """
+    shape: tuple
+    mask: bytearray
+    index: array
+    values: array
+
+    def __len__(self):
+        return len(self.index)
+
+    def flat_index(self, pos) -> int:
+        flat = 0
+        for i, n in zip(pos, self.shape):
+            flat = flat * n + i
+        return flat
+
+    def is_connected(self, pos) -> bool:
+        return self.mask[self.flat_index(pos)] != 0
+
+    def __getitem__(self, pos) -> T_delay:
+        flat = self.flat_index(pos)
+        if not self.mask[flat]:
+            return T_delay(T_delay_tri(NOT_CONNECTED, NOT_CONNECTED, NOT_CONNECTED), T_delay_tri(NOT_CONNECTED, NOT_CONNECTED, NOT_CONNECTED))
+        i = bisect_left(self.index, flat) * 6
+        return T_delay(T_delay_tri(*self.values[i:i+3]), T_delay_tri(*self.values[i+3:i+6]))
+
+    def positions(self):
+        return compress(product(*(range(n) for n in self.shape)), self.mask)
+
+    def raw_items(self):
+        """Yields (position, values) for connected entries, values being 6-tuple."""
+        d = iter(self.values)
+        return zip(self.positions(), zip(d, d, d, d, d, d))
+
+    def items(self):
+        for pos, v in self.raw_items():
+            yield pos, T_delay(T_delay_tri(*v[:3]), T_delay_tri(*v[3:]))
+
+def read_sparse_delay_arr_from_bytes(shape):
+    count = prod(shape)
+    def read(mv: memoryview, offset: int) -> (SparseDelayArray, int):
+        mask = bytearray(count)
+        index = array('i')
+        values = array('i')
+        for i, d in enumerate(iter_unpack_from(T_DELAY_STRUCT, mv, offset, count)):
+            if d[0] != NOT_CONNECTED:
+                mask[i] = 1
+                index.append(i)
+                values.extend(d)
+        return SparseDelayArray(shape, mask, index, values), offset + count * T_DELAY_SIZE
+    return read
+
+SPARSE_SECTION_SHAPES = {
+    'SB_del_tile_arr' : (4, 8, 4, 12, 5, 8),
+    'IM_del_tile_arr' : (2, 8, 8, 12, 8),
+    'OM_del_tile_arr' : (8, 8, 4, 4),
+    'SB_del_rim_arr' : (165, 4, 12, 5, 8),
+    'Edge_del_arr' : (165, 4, 24, 8),
+    'IO_SEL_del_arr' : (11, 4),
+    'CLKIN_del_arr' : (7, 4),
+    'GLBOUT_del_arr' : (28, 8),
+    'PLL_del_arr' : (7, 6),
+}
+
+class Tdel_all_rec_sparse(LazyRecord):
+    """Lazy Tdel_all_rec with T_delay arrays as SparseDelayArray."""
+    SECTIONS = [(name, read_sparse_delay_arr_from_bytes(SPARSE_SECTION_SHAPES[name]), size) if name in SPARSE_SECTION_SHAPES else (name, reader, size)
+                for name, reader, size in Tdel_all_rec_lazy.SECTIONS]
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def iter_timing_sections(input_path, decode=True, chunk_size=STREAM_CHUNK_SIZE, layout=Tdel_all_rec_lazy):
+    """Yields (name, section) of Tdel_all_rec in file order.
+
+    Input is decompressed in chunks and each section is yielded as soon as
+    all of its bytes are available, so at most one section is held in
+    memory. With decode=False raw section bytes are yielded instead.
+    Sections are decoded with readers from given layout. Corrupt input is
+    reported as in decompress_timing and zlib.error is raised.
+    """
+    decompressor = zlib.decompressobj()
+    sections = iter(layout.SECTIONS)
+    name, reader, size = next(sections)
+    buf = bytearray()
+    with open(input_path, 'rb') as f_in:
+        while name is not None:
+            chunk = decompressor.unconsumed_tail or f_in.read(chunk_size)
+            try:
+                # Never inflate past end of current section
+                buf += decompressor.decompress(chunk, size - len(buf)) if chunk else decompressor.flush()
+            except zlib.error as e:
+                print(f"Decompression failed: {e}")
+                raise
+            while name is not None and len(buf) >= size:
+                data = bytes(buf[:size])
+                del buf[:size]
+                if reader is not None:
+                    yield name, reader(data, 0)[0] if decode else data
+                name, reader, size = next(sections, (None, None, 0))
+            if not chunk:
+                break
+    if name is not None:
+        raise EOFError("Unexpected end of data")
+
+class Tdel_all_rec_stream:
+    """Forward only view of Tdel_all_rec backed by iter_timing_sections.
+
+    Sections must be accessed in file order, only most recent one is kept.
+    """
+
+    def __init__(self, input_path, chunk_size=STREAM_CHUNK_SIZE, layout=Tdel_all_rec_lazy):
+        self._sections = iter_timing_sections(input_path, chunk_size=chunk_size, layout=layout)
+        self._name = None
+        self._value = None
+        self._error = None
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in Tdel_all_rec_lazy.LAYOUT:
+            raise AttributeError(name)
+        while self._name != name:
+            self._value = None
+            if self._error is not None:
+                raise self._error
+            try:
+                section = next(self._sections, None)
+            except (zlib.error, EOFError) as e:
+                # Input is broken, report same error for all later sections
+                self._error = e
+                raise
+            if section is None:
+                raise AttributeError(f"{name} is not available, sections must be read in file order")
+            self._name, self._value = section
+        return self._value
+
+
+def get_sidecar_path(input_path):
+    """Returns path of uncompressed data for input_path if usable, otherwise None.
+
+    Raw .bin files are used directly, for .dly file a .bin file next to it
+    (as written by decompress.py) is used if it was written after .dly
+    was placed. Inode change time of .dly is used for that, as extracting
+    with tar keeps vendor's modification time.
+    """
+    base, ext = os.path.splitext(input_path)
+    if ext == ".bin":
+        return input_path
+    path = base + ".bin"
+    try:
+        st = os.stat(path)
+        if st.st_size == Tdel_all_rec_lazy.SIZE and st.st_mtime_ns >= os.stat(input_path).st_ctime_ns:
+            return path
+    except OSError:
+        pass
+    return None
+
+def map_timing_file(path) -> mmap.mmap:
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def read_timing_data(input_path):
+    """Returns uncompressed timing data, mapped read-only from sidecar if available."""
+    sidecar = get_sidecar_path(input_path)
+    if sidecar is not None:
+        return map_timing_file(sidecar)
     with open(input_path, 'rb') as f_in:
         compressed_data = f_in.read()
+    return zlib.decompress(compressed_data)
+
+def decompress_timing(input_path, lazy=False, stream=False, sparse=False) -> 'Tdel_all_rec':
+    layout = Tdel_all_rec_sparse if sparse else Tdel_all_rec_lazy
+    # Mapped sidecar is shared through page cache, no need to stream it
+    if stream and get_sidecar_path(input_path) is None:
+        return Tdel_all_rec_stream(input_path, layout=layout)
     try:
-        decompressed_data = zlib.decompress(compressed_data)
+        data = read_timing_data(input_path)
     except zlib.error as e:
         print(f"Decompression failed: {e}")
         return
-    
-    return Tdel_all_rec.from_bytes(decompressed_data)
+
+    if lazy or stream or sparse:
+        return layout.from_bytes(data)
+    return Tdel_all_rec.from_bytes(data)
 
 # Example usage
 #decompress_timing("cc_best_eco_dly.dly")
@@ -0,0 +1,91 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+# On-disk cache of flattened timing corners.
+#
+# File layout (little-endian):
+#   header   magic "GMTC", format version, number of delays N,
+#            32 byte key, size of name table
+#   values   int32 [N][rise/fall][min/typ/max]
+#   names    N delay names separated by newline
+#
+# Key is SHA-256 over .dly content and the given versions, so changing
+# any of them invalidates the cached file.
+
+import sys
+import mmap
+import struct
+import hashlib
+import cache_file
+from array import array
+from typing import List, Optional, Tuple
+
+CACHE_ENV = "PEPPERCORN_TIMING_CACHE"
+MAGIC = b"GMTC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sII32sI')
+
+def get_cache_dir(cache_dir=None) -> Optional[str]:
+    return cache_file.get_cache_dir(cache_dir, CACHE_ENV)
+
+def cache_key(input_path, *versions) -> bytes:
+    h = hashlib.sha256()
+    with open(input_path, 'rb') as f:
+        h.update(f.read())
+    for v in versions:
+        h.update(f"\0{v}".encode('ascii'))
+    return h.digest()
+
+def store(path, key: bytes, names: List[str], values) -> None:
+    names_data = "\n".join(names).encode('ascii')
+    data = array('i', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    with cache_file.write_atomic(path) as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(names), key, len(names_data)))
+        data.tofile(f)
+        f.write(names_data)
+
+def load(path, key: bytes) -> Optional[Tuple[List[str], memoryview]]:
+    """Returns (names, values) or None if file is missing or stale.
+
+    Values are int32 view on mapped file, 6 per delay name.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mm) < HEADER.size:
+        mm.close()
+        return None
+    magic, version, count, file_key, names_size = HEADER.unpack_from(mm, 0)
+    values_end = HEADER.size + count * 24
+    if magic != MAGIC or version != FORMAT_VERSION or file_key != key or len(mm) != values_end + names_size:
+        mm.close()
+        return None
+    try:
+        names = mm[values_end:].decode('ascii').split("\n") if count else []
+    except UnicodeDecodeError:
+        mm.close()
+        return None
+    values = memoryview(mm)[HEADER.size:values_end].cast('i')
+    if sys.byteorder != 'little':
+        values = array('i', values)
+        values.byteswap()
+    return names, values
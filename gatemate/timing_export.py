@@ -0,0 +1,128 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+# Binary export of one timing corner for chip database generators.
+#
+# File layout (little-endian, every section 8 byte aligned):
+#   header         magic "GMTE", format version, number of delays N,
+#                  palette size P (0 if no palette), corner name (16 bytes),
+#                  offsets of values, palette, index, name offsets and
+#                  names sections (uint64, 0 if section is missing)
+#   values         int32 [N][rise/fall][min/typ/max]
+#   palette        int32 [P][rise/fall][min/typ/max] unique values
+#   index          int32 [N] palette index of each delay
+#   name offsets   uint32 [N+1] start of each name in names section
+#   names          ASCII delay names, not separated
+#
+# Each section can be mapped with numpy.frombuffer/numpy.fromfile using
+# its offset from header.
+#
+# Unlike timing_cache files, which are private to this package and may
+# change layout with any FORMAT_VERSION bump, this layout is meant to be
+# read by external tools: it has no content key, keeps every section
+# aligned and has name offsets so names can be read without parsing.
+
+import mmap
+import struct
+import numpy as np
+import chip
+import cache_file
+from dataclasses import dataclass
+from typing import List, Optional
+
+MAGIC = b"GMTE"
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sIII16s5Q')
+
+def align(offset) -> int:
+    return (offset + 7) & ~7
+
+@dataclass
+class TimingExport:
+    corner : str
+    names : List[str]
+    values : np.ndarray
+    palette : Optional[np.ndarray] = None
+    index : Optional[np.ndarray] = None
+
+    def timings(self):
+        """Returns delays in same form as chip.get_timings."""
+        return chip.unflatten_timings(self.names, self.values.ravel().tolist())
+
+CORNER_NAME_SIZE = 16
+
+def write(path, corner, names, values, palette=None, index=None) -> None:
+    corner_name = corner.encode('ascii')
+    if len(corner_name) > CORNER_NAME_SIZE:
+        raise ValueError(f"Corner name {corner} is longer than {CORNER_NAME_SIZE} bytes")
+    encoded = [name.encode('ascii') for name in names]
+    name_offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+    np.cumsum([len(name) for name in encoded], out=name_offsets[1:])
+    sections = [np.asarray(values, dtype='<i4').reshape(-1, 2, 3)]
+    if palette is not None:
+        sections.append(np.asarray(palette, dtype='<i4').reshape(-1, 2, 3))
+        sections.append(np.asarray(index, dtype='<i4'))
+    else:
+        sections += [None, None]
+    sections += [name_offsets, b"".join(encoded)]
+
+    offsets = []
+    offset = HEADER.size
+    for data in sections:
+        if data is None:
+            offsets.append(0)
+            continue
+        offset = align(offset)
+        offsets.append(offset)
+        offset += len(data) if isinstance(data, bytes) else data.nbytes
+
+    with cache_file.write_atomic(path) as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(names), 0 if palette is None else len(sections[1]),
+                            corner_name, *offsets))
+        for data, offset in zip(sections, offsets):
+            if data is None:
+                continue
+            f.write(bytes(offset - f.tell()))
+            f.write(data if isinstance(data, bytes) else data.tobytes())
+
+def export_timings(path, corner, palette=False, cache_dir=None) -> None:
+    if palette:
+        names, timings, index = chip.get_timing_palette(corner, cache_dir)
+        palette_values = np.array([t.as_tuple() for t in timings], dtype=np.int32).reshape(-1, 2, 3)
+        index = np.frombuffer(index, dtype=np.int32)
+        write(path, corner, names, palette_values[index], palette_values, index)
+    else:
+        names, values = chip.get_flat_timings(corner, cache_dir)
+        write(path, corner, names, values)
+
+def load(path) -> TimingExport:
+    """Maps exported file read-only, arrays are views on mapped data."""
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count, palette_size, corner, values_offset, palette_offset, index_offset, name_offsets_offset, names_offset = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a timing export file")
+    values = np.frombuffer(mm, dtype='<i4', count=count * 6, offset=values_offset).reshape(count, 2, 3)
+    palette = index = None
+    if palette_offset:
+        palette = np.frombuffer(mm, dtype='<i4', count=palette_size * 6, offset=palette_offset).reshape(palette_size, 2, 3)
+        index = np.frombuffer(mm, dtype='<i4', count=count, offset=index_offset)
+    name_offsets = np.frombuffer(mm, dtype='<u4', count=count + 1, offset=name_offsets_offset).tolist()
+    names_data = mm[names_offset:names_offset + name_offsets[-1]].decode('ascii')
+    names = [names_data[a:b] for a, b in zip(name_offsets, name_offsets[1:])]
+    return TimingExport(corner.rstrip(b"\0").decode('ascii'), names, values, palette, index)
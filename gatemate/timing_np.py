@@ -0,0 +1,272 @@
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+# NumPy backend for timing database. Whole Tdel_all_rec is described
+# as a single structured dtype and mapped with np.frombuffer, so no
+# per-entry objects are created until an element is actually accessed.
+
+import zlib
+import numpy as np
+from timing import read_timing_data, T_delay_tri, T_delay, Tpin_pair, Tentry_rec, Tdel_entry, TRAM_del_rec, Tdel_rec, Tdel_rec_tri, ExtraTimingDelays
+
+T_DELAY_TRI = np.dtype(('<i4', (3,)))
+T_DELAY = np.dtype(('<i4', (2, 3)))  # [rise/fall, min/typ/max]
+
+TDEL_REC = np.dtype([
+    ('val', T_DELAY),
+    ('conf_mux', '<i4'),
+    ('name_len', 'u1'),
+    ('name', 'S23'),  # string[22] plus alignment
+    ('x', '<i4'),
+    ('y', '<i4'),
+    ('plane', '<i4'),
+    ('dir', '<i4'),
+    ('inv', '<i4'),
+    ('cnt', '<i4'),
+    ('con_type', 'u1'),
+    ('_align', 'V3'),
+])
+
+TDEL_REC_TRI = np.dtype([
+    ('val', T_DELAY_TRI),
+    ('conf_mux', '<i4'),
+    ('name_len', 'u1'),
+    ('name', 'S23'),
+    ('x', '<i4'),
+    ('y', '<i4'),
+])
+
+TENTRY_REC = np.dtype([
+    ('i', '<i2'),
+    ('o_or_clk', '<i2'),
+    ('entry_no', '<i2'),
+])
+
+TDEL_ENTRY = np.dtype([
+    ('key', '<i4'),
+    ('edge1', '<i4'),
+    ('edge2', '<i4'),
+    ('time1', T_DELAY_TRI),
+    ('time2', T_DELAY_TRI),
+])
+
+TRAM_DEL_REC = np.dtype([
+    ('iopath', TENTRY_REC, (3001,)),
+    ('setuphold', TENTRY_REC, (8001,)),
+    ('width', TENTRY_REC, (51,)),
+    ('_align', 'V2'),
+    ('del_entry', TDEL_ENTRY, (101,)),
+])
+
+EXTRA_TIMING_DELAYS = np.dtype([
+    ('skew_report_del', '<i4'),
+    ('fix_skew_del', '<i4'),
+    ('del_rec_0', TDEL_REC),
+    ('del_min_route_SB', TDEL_REC),
+    ('del_violation_common', TDEL_REC_TRI),
+    ('del_dummy', TDEL_REC),
+    ('del_Hold_D_L', TDEL_REC_TRI),
+    ('del_Hold_RAM', TDEL_REC_TRI),
+    ('del_Setup_D_L', TDEL_REC_TRI),
+    ('del_Setup_RAM', TDEL_REC_TRI),
+    ('del_Hold_SN_RN', TDEL_REC_TRI),
+    ('del_Setup_SN_RN', TDEL_REC_TRI),
+    ('del_Hold_RN_SN', TDEL_REC_TRI),
+    ('del_Setup_RN_SN', TDEL_REC_TRI),
+    ('del_bot_couty2', TDEL_REC),
+    ('del_bot_glb_couty2', TDEL_REC),
+    ('del_bot_SB_couty2', TDEL_REC),
+    ('del_bot_pouty2', TDEL_REC),
+    ('del_bot_glb_pouty2', TDEL_REC),
+    ('del_bot_SB_pouty2', TDEL_REC),
+    ('del_left_couty2', TDEL_REC),
+    ('del_left_glb_couty2', TDEL_REC),
+    ('del_left_SB_couty2', TDEL_REC),
+    ('del_left_pouty2', TDEL_REC),
+    ('del_left_glb_pouty2', TDEL_REC),
+    ('del_left_SB_pouty2', TDEL_REC),
+    ('del_inp', TDEL_REC, (8,)),
+    ('del_CPE_out_mux', TDEL_REC, (4,)),
+    ('del_CPE_CP_Q', TDEL_REC),
+    ('del_CPE_S_Q', TDEL_REC),
+    ('del_CPE_R_Q', TDEL_REC),
+    ('del_CPE_D_Q', TDEL_REC),
+    ('del_RAM_CLK_DO', TDEL_REC),
+    ('del_GLBOUT_sb_big', TDEL_REC),
+    ('del_sb_drv', TDEL_REC),
+    ('del_CP_carry_path', TDEL_REC),
+    ('del_CP_prop_path', TDEL_REC),
+    ('del_special_RAM_I', TDEL_REC),
+    ('del_RAMO_xOBF', TDEL_REC),
+    ('del_GLBOUT_IO_SEL', TDEL_REC),
+    ('del_IO_SEL_Q_out', TDEL_REC),
+    ('del_IO_SEL_Q_in', TDEL_REC),
+    ('in_delayline_per_stage', TDEL_REC),
+    ('out_delayline_per_stage', TDEL_REC),
+    ('del_IBF', TDEL_REC),
+    ('del_OBF', TDEL_REC),
+    ('del_r_OBF', TDEL_REC),
+    ('del_TOBF_ctrl', TDEL_REC),
+    ('del_LVDS_IBF', TDEL_REC),
+    ('del_LVDS_OBF', TDEL_REC),
+    ('del_LVDS_r_OBF', TDEL_REC),
+    ('del_LVDS_TOBF_ctrl', TDEL_REC),
+    ('del_CP_clkin', TDEL_REC),
+    ('del_CP_enin', TDEL_REC),
+    ('del_preplace', TDEL_REC),
+    ('del_CPE_timing_mod', TDEL_REC, (42,)),
+])
+
+TDEL_ALL_REC = np.dtype([
+    ('SB_del_tile_arr', '<i4', (4, 8, 4, 12, 5, 8, 2, 3)),
+    ('IM_del_tile_arr', '<i4', (2, 8, 8, 12, 8, 2, 3)),
+    ('OM_del_tile_arr', '<i4', (8, 8, 4, 4, 2, 3)),
+    ('CPE_del_tile_arr', TDEL_REC, (10, 19, 10)),
+    ('SB_del_rim_arr', '<i4', (165, 4, 12, 5, 8, 2, 3)),
+    ('Edge_del_arr', '<i4', (165, 4, 24, 8, 2, 3)),
+    ('IO_SEL_del_arr', '<i4', (11, 4, 2, 3)),
+    ('CLKIN_del_arr', '<i4', (7, 4, 2, 3)),
+    ('GLBOUT_del_arr', '<i4', (28, 8, 2, 3)),
+    ('PLL_del_arr', '<i4', (7, 6, 2, 3)),
+    ('FPGA_ram_del_1', TRAM_DEL_REC),
+    ('FPGA_ram_del_2', TRAM_DEL_REC),
+    ('FPGA_ram_del_3', TRAM_DEL_REC),
+    ('IO_SEL_io_coef', '<f8', (4, 27)),
+    ('timing_delays', EXTRA_TIMING_DELAYS),
+])
+
+def _name(rec) -> str:
+    return bytes(rec['name'])[:rec['name_len']].decode('ascii')
+
+def to_T_delay_tri(a) -> T_delay_tri:
+    return T_delay_tri(*a.tolist())
+
+def to_T_delay(a) -> T_delay:
+    rise, fall = a.tolist()
+    return T_delay(T_delay_tri(*rise), T_delay_tri(*fall))
+
+def to_Tdel_rec(rec) -> Tdel_rec:
+    return Tdel_rec(to_T_delay(rec['val']), int(rec['conf_mux']), _name(rec),
+                    int(rec['x']), int(rec['y']), int(rec['plane']), int(rec['dir']),
+                    int(rec['inv']), int(rec['cnt']), int(rec['con_type']))
+
+def to_Tdel_rec_tri(rec) -> Tdel_rec_tri:
+    return Tdel_rec_tri(to_T_delay_tri(rec['val']), int(rec['conf_mux']), _name(rec),
+                        int(rec['x']), int(rec['y']))
+
+def to_Tentry_rec(rec) -> Tentry_rec:
+    return Tentry_rec(Tpin_pair(int(rec['i']), int(rec['o_or_clk'])), int(rec['entry_no']))
+
+def to_Tdel_entry(rec) -> Tdel_entry:
+    return Tdel_entry(int(rec['key']), int(rec['edge1']), int(rec['edge2']),
+                      to_T_delay_tri(rec['time1']), to_T_delay_tri(rec['time2']))
+
+class ArrayView:
+    """Indexes like the nested lists of timing.py, converting leaf elements on access."""
+
+    def __init__(self, array, convert, leaf_ndim=0):
+        self.array = array
+        self.convert = convert
+        self.leaf_ndim = leaf_ndim
+
+    def __getitem__(self, index):
+        item = self.array[index]
+        if item.ndim > self.leaf_ndim:
+            return ArrayView(item, self.convert, self.leaf_ndim)
+        return self.convert(item)
+
+    def __len__(self):
+        return len(self.array)
+
+    def __iter__(self):
+        for i in range(len(self.array)):
+            yield self[i]
+
+def delay_view(array) -> ArrayView:
+    return ArrayView(array, to_T_delay, 2)
+
+class TRAM_del_rec_view:
+    def __init__(self, rec):
+        self.rec = rec
+        self.iopath = ArrayView(rec['iopath'], to_Tentry_rec)
+        self.setuphold = ArrayView(rec['setuphold'], to_Tentry_rec)
+        self.width = ArrayView(rec['width'], to_Tentry_rec)
+        self.del_entry = ArrayView(rec['del_entry'], to_Tdel_entry)
+
+    def to_record(self) -> TRAM_del_rec:
+        return TRAM_del_rec(list(self.iopath), list(self.setuphold), list(self.width), list(self.del_entry))
+
+def to_ExtraTimingDelays(rec) -> ExtraTimingDelays:
+    values = []
+    for name in EXTRA_TIMING_DELAYS.names:
+        field = rec[name]
+        base = EXTRA_TIMING_DELAYS.fields[name][0].base
+        if base == TDEL_REC:
+            values.append([to_Tdel_rec(r) for r in field] if field.ndim else to_Tdel_rec(field))
+        elif base == TDEL_REC_TRI:
+            values.append(to_Tdel_rec_tri(field))
+        else:
+            values.append(int(field))
+    return ExtraTimingDelays(*values)
+
+class Tdel_all_rec:
+    """Zero-copy view of timing database with same attributes as timing.Tdel_all_rec.
+
+    Raw arrays are in ``data``, e.g. ``data['SB_del_tile_arr']`` is int32 array
+    shaped [4,8,4,12,5,8,2,3], last two dimensions being [rise/fall, min/typ/max].
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.SB_del_tile_arr = delay_view(data['SB_del_tile_arr'])
+        self.IM_del_tile_arr = delay_view(data['IM_del_tile_arr'])
+        self.OM_del_tile_arr = delay_view(data['OM_del_tile_arr'])
+        self.CPE_del_tile_arr = ArrayView(data['CPE_del_tile_arr'], to_Tdel_rec)
+        self.SB_del_rim_arr = delay_view(data['SB_del_rim_arr'])
+        self.Edge_del_arr = delay_view(data['Edge_del_arr'])
+        self.IO_SEL_del_arr = delay_view(data['IO_SEL_del_arr'])
+        self.CLKIN_del_arr = delay_view(data['CLKIN_del_arr'])
+        self.GLBOUT_del_arr = delay_view(data['GLBOUT_del_arr'])
+        self.PLL_del_arr = delay_view(data['PLL_del_arr'])
+        self.FPGA_ram_del_1 = TRAM_del_rec_view(data['FPGA_ram_del_1'])
+        self.FPGA_ram_del_2 = TRAM_del_rec_view(data['FPGA_ram_del_2'])
+        self.FPGA_ram_del_3 = TRAM_del_rec_view(data['FPGA_ram_del_3'])
+        self.IO_SEL_io_coef = data['IO_SEL_io_coef'].tolist()
+        self._timing_delays = None
+
+    @property
+    def timing_delays(self) -> ExtraTimingDelays:
+        if self._timing_delays is None:
+            self._timing_delays = to_ExtraTimingDelays(self.data['timing_delays'])
+        return self._timing_delays
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'Tdel_all_rec':
+        if len(data) < TDEL_ALL_REC.itemsize:
+            raise EOFError("Unexpected end of data")
+        return Tdel_all_rec(np.frombuffer(data, dtype=TDEL_ALL_REC, count=1)[0])
+
+
+def decompress_timing(input_path) -> 'Tdel_all_rec':
+    try:
+        data = read_timing_data(input_path)
+    except zlib.error as e:
+        print(f"Decompression failed: {e}")
+        return
+
+    return Tdel_all_rec.from_bytes(data)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+"""Export timing corners as binary files for chip database generators."""
+
+import os
+import sys
+import argparse
+import chip
+import timing_export
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('outdir', type=str,
+                    help="output directory")
+parser.add_argument('-c', '--corner', action='append', choices=chip.TIMING_CORNERS,
+                    help="corner to export (default all)")
+parser.add_argument('-p', '--palette', action='store_true',
+                    help="include palette of unique delay values")
+
+def main(argv):
+    args = parser.parse_args(argv[1:])
+    os.makedirs(args.outdir, exist_ok=True)
+    for corner in args.corner or chip.TIMING_CORNERS:
+        path = os.path.join(args.outdir, f"cc_{corner}_timing.bin")
+        timing_export.export_timings(path, corner, args.palette)
+        print(f"Written {path}")
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+"""Build or refresh cached routing graphs of devices."""
+
+import sys
+import argparse
+import chip
+import graph_cache
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('device', type=str, nargs='*',
+                    help="device name (default all, e.g. CCGM1A1)")
+parser.add_argument('--cache-dir', type=str, default=None,
+                    help=f"cache directory (default ${graph_cache.CACHE_ENV})")
+parser.add_argument('--rebuild', action='store_true',
+                    help="rebuild graphs even if cached ones are valid")
+
+def main(argv):
+    args = parser.parse_args(argv[1:])
+    cache_dir = graph_cache.get_cache_dir(args.cache_dir)
+    if cache_dir is None:
+        parser.error(f"no cache directory, use --cache-dir or set {graph_cache.CACHE_ENV}")
+    for device in args.device or chip.get_all_devices().keys():
+        graph = graph_cache.get_cached_routing_graph(device, cache_dir, args.rebuild)
+        print(f"{device}: {len(graph)} nodes, {graph.num_edges} edges, {graph.nbytes / 1e6:.1f} MB")
+    s = graph_cache.stats
+    print(f"hits {s.hits}, misses {s.misses}, load {s.load_time:.2f}s, build {s.build_time:.2f}s, written {s.bytes_written / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main(sys.argv)
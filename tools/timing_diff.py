@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+#
+#  prjpeppercorn -- GateMate FPGAs Bitstream Documentation and Tools
+#
+#  Copyright (C) 2024  The Project Peppercorn Authors.
+#
+#  Permission to use, copy, modify, and/or distribute this software for any
+#  purpose with or without fee is hereby granted, provided that the above
+#  copyright notice and this permission notice appear in all copies.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+#  WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+#  ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+#  WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+#  ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+#  OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+#
+
+"""Compare delays of two sets of .dly files (e.g. old and new delay/ directory)."""
+
+import os
+import sys
+import argparse
+import numpy as np
+import chip
+import timing_cache
+from concurrent.futures import ProcessPoolExecutor
+from delay_matrix import DelayMatrix
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument('old', type=str,
+                    help="directory with old cc_*_dly.dly files")
+parser.add_argument('new', type=str,
+                    help="directory with new cc_*_dly.dly files")
+parser.add_argument('-c', '--corner', action='append', choices=chip.TIMING_CORNERS,
+                    help="corner to compare (default all)")
+parser.add_argument('-t', '--threshold', type=int, default=0,
+                    help="report only delays changed by more than threshold")
+parser.add_argument('-j', '--jobs', type=int, default=None,
+                    help="number of worker processes")
+parser.add_argument('--cache-dir', type=str, default=None,
+                    help=f"timing cache directory (default ${timing_cache.CACHE_ENV})")
+
+# Checked in order, first matching prefix wins, CPE delays have no common prefix
+SECTIONS = [
+    ("sb_del", "sb_del_"),
+    ("sb_rim", "sb_rim_"),
+    ("im", "im_"),
+    ("om", "om_"),
+    ("edge", "edge_"),
+    ("io_sel", "io_sel_"),
+    ("clkin", "clkin_"),
+    ("glbout", "glbout_"),
+    ("pll", "pll_"),
+    ("RAM", "RAM_"),
+    ("misc", "del_"),
+    ("misc", "in_delayline_"),
+    ("misc", "out_delayline_"),
+]
+
+def get_section(name):
+    for section, prefix in SECTIONS:
+        if name.startswith(prefix):
+            return section
+    return "CPE"
+
+def load_flat(corner, dly_path, cache_dir):
+    """Returns (names, values) for .dly file, using timing cache if it matches."""
+    cache_path = chip.get_timing_cache_path(corner, cache_dir)
+    if cache_path is not None:
+        key = timing_cache.cache_key(dly_path, chip.DATABASE_VERSION, chip.TIMING_VERSION)
+        cached = timing_cache.load(cache_path, key)
+        if cached is not None:
+            return cached[0], np.array(cached[1], dtype=np.int32)
+    names, values = chip.flatten_timings(chip.build_timings(dly_path))
+    return names, np.array(values, dtype=np.int32)
+
+def format_delay(v):
+    return f"{v[0,0]}/{v[0,1]}/{v[0,2]} {v[1,0]}/{v[1,1]}/{v[1,2]}"
+
+def report_corner(corner, m, threshold, fout):
+    present_old, present_new = m.present
+    diff = m.diff("old", "new")
+    delta = np.abs(diff).reshape(len(m.names), 6).max(axis=1)
+    changed = np.flatnonzero(delta > threshold)
+    added = np.flatnonzero(present_new & ~present_old)
+    removed = np.flatnonzero(present_old & ~present_new)
+    print(f"== {corner}: {len(changed)} changed, {len(added)} added, {len(removed)} removed", file=fout)
+    groups = dict()
+    for kind, idx in (("changed", changed), ("added", added), ("removed", removed)):
+        for i in idx:
+            groups.setdefault(get_section(m.names[i]), []).append((kind, i))
+    for section in [*dict.fromkeys(s for s, _ in SECTIONS), "CPE"]:
+        if section not in groups:
+            continue
+        print(f"  {section}: {len(groups[section])}", file=fout)
+        for kind, i in groups[section]:
+            name = m.names[i]
+            match kind:
+                case "changed":
+                    print(f"    {name}: {format_delay(m.values[0, i])} -> {format_delay(m.values[1, i])} (max {delta[i]})", file=fout)
+                case "added":
+                    print(f"    {name}: added {format_delay(m.values[1, i])}", file=fout)
+                case "removed":
+                    print(f"    {name}: removed {format_delay(m.values[0, i])}", file=fout)
+
+def main(argv):
+    args = parser.parse_args(argv[1:])
+    corners = args.corner or chip.TIMING_CORNERS
+    cache_dir = timing_cache.get_cache_dir(args.cache_dir)
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = { corner : [executor.submit(load_flat, corner, os.path.join(d, f"cc_{corner}_dly.dly"), cache_dir)
+                              for d in (args.old, args.new)] for corner in corners }
+        for corner, (old, new) in futures.items():
+            m = DelayMatrix.from_flat({ "old" : old.result(), "new" : new.result() })
+            report_corner(corner, m, args.threshold, sys.stdout)
+
+if __name__ == "__main__":
+    main(sys.argv)